@@ -5,9 +5,11 @@ A modern music downloader API built with FastAPI.
 Supports YouTube, YouTube Music, and Spotify platforms.
 """
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 from src.api.v1.router import api_router
@@ -21,13 +23,14 @@ def create_application() -> FastAPI:
         description="Music downloader service supporting YouTube and Spotify",
         version="2.3.0",
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        default_response_class=ORJSONResponse
     )
 
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],  # Configure appropriately for production
+        allow_origins=frozenset(settings.cors_origins),  # Set CORS_ORIGINS for production
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -39,7 +42,7 @@ def create_application() -> FastAPI:
     @app.get("/")
     async def root():
         """Root endpoint with API information."""
-        return JSONResponse({
+        return ORJSONResponse({
             "message": "LocalSongs API",
             "version": "2.3.0",
             "docs": "/docs",
@@ -49,12 +52,12 @@ def create_application() -> FastAPI:
     @app.get("/health")
     async def health_check():
         """Health check endpoint."""
-        from src.services.download_service import DownloadService
+        from src.services.download_service import download_service
         
-        service = DownloadService()
-        health_status = service.health_check()
+        # Runs the spotdl subprocess probe; keep it off the event loop
+        health_status = await asyncio.to_thread(download_service.health_check)
         
-        return JSONResponse(health_status)
+        return ORJSONResponse(health_status)
 
     return app
 
@@ -6,17 +6,18 @@ with configurable quality settings and comprehensive error handling.
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-from typing import Dict, Any
+from fastapi.responses import FileResponse, ORJSONResponse
+from typing import Dict, Any, List, Optional
 import os
 import logging
 import asyncio
 import uuid
 from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 import signal
 
-from ....services.download_service import downloader, AudioQuality, DownloadService
+from ....services.download_service import get_downloader, download_service, AudioQuality, DownloadService
 from ....services.playlist_service import multi_downloader, PlaylistService
 from .progress import create_progress_tracker, ProgressTracker
 from .multi_download import create_multi_download_tracker, MultiFileProgressTracker
@@ -30,11 +31,19 @@ from ....schemas.models import (
 from ....core.utils import URLValidator, QualityManager, FileUtils
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Thread pool for blocking operations
 executor = ThreadPoolExecutor(max_workers=2)
 
+# Audio file extensions listed by /list-files (lowercase, without dot)
+_AUDIO_SUFFIXES = frozenset({"mp3", "wav", "flac", "m4a"})
+
+def _count_mp3_files(directory: Path) -> int:
+    """Count the MP3 files in a directory (blocking, single scandir pass)."""
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(".mp3") and entry.is_file())
+
 async def download_spotify_playlist_task(download_id: str, url: str, quality: AudioQuality, playlist_info: Dict[str, Any]):
     """
     Background task super simple para descargar de Spotify usando spotdl directamente
@@ -100,10 +109,10 @@ async def download_spotify_playlist_task(download_id: str, url: str, quality: Au
             logger.info(f"Stderr: {stderr_msg}")
             
             # Verificar si se descargó algo
-            download_files = list(output_dir.glob("*.mp3"))
-            if download_files:
-                logger.info(f"Se descargaron {len(download_files)} archivos a pesar de los errores")
-                multi_progress_tracker.update_overall("completed", f"Descarga parcial completada - {len(download_files)} archivos descargados")
+            downloaded_count = await asyncio.to_thread(_count_mp3_files, output_dir)
+            if downloaded_count:
+                logger.info(f"Se descargaron {downloaded_count} archivos a pesar de los errores")
+                multi_progress_tracker.update_overall("completed", f"Descarga parcial completada - {downloaded_count} archivos descargados")
             else:
                 error_msg = f"No se pudo descargar ningún archivo. Errores: {stderr_msg[:200]}"
                 multi_progress_tracker.update_overall("error", error_msg, error_msg)
@@ -172,7 +181,7 @@ async def download_audio(request: DownloadRequest) -> DownloadResponse:
             
             # Crear una función wrapper que no use asyncio internamente
             def download_wrapper():
-                return downloader.download_audio(request.url, quality, progress_tracker)
+                return get_downloader().download_audio(request.url, quality, progress_tracker)
             
             # Timeout de 5 minutos para la descarga
             result = await asyncio.wait_for(
@@ -236,9 +245,12 @@ async def download_audio(request: DownloadRequest) -> DownloadResponse:
         )
 
 @router.get("/info", response_model=AudioInfoResponse)
-async def get_audio_info(url: str) -> AudioInfoResponse:
+async def get_audio_info(url: str, basic: bool = False) -> AudioInfoResponse:
     """
     Obtener información del audio sin descargarlo
+    
+    Con basic=true, para YouTube solo se consulta oEmbed (título, autor y
+    miniatura, sin duración ni vistas), mucho más rápido que yt-dlp.
     """
     try:
         # Validar URL
@@ -253,15 +265,9 @@ async def get_audio_info(url: str) -> AudioInfoResponse:
         
         # Obtener información con timeout
         try:
-            loop = asyncio.get_event_loop()
-            
             # Timeout de 30 segundos para obtener info
             info = await asyncio.wait_for(
-                loop.run_in_executor(
-                    executor, 
-                    downloader.get_audio_info, 
-                    url
-                ),
+                download_service.get_audio_info_async(url, basic_only=basic),
                 timeout=30.0  # 30 segundos
             )
             
@@ -310,7 +316,7 @@ async def health_check() -> HealthResponse:
     Verificar estado de los servicios
     """
     try:
-        health = downloader.health_check()
+        health = await asyncio.to_thread(download_service.health_check)
         return HealthResponse(
             status=health['status'],
             message=health['message'],
@@ -349,7 +355,7 @@ async def download_file(filename: str) -> FileResponse:
     Descargar archivo previamente procesado
     """
     try:
-        file_path = os.path.join(downloader.output_dir, filename)
+        file_path = os.path.join(get_downloader().output_dir, filename)
         
         if not os.path.exists(file_path):
             raise HTTPException(
@@ -462,7 +468,7 @@ async def download_with_progress(request: DownloadRequest) -> Dict[str, str]:
                 loop = asyncio.get_event_loop()
                 
                 def download_wrapper():
-                    return downloader.download_audio(request.url, quality, progress_tracker)
+                    return get_downloader().download_audio(request.url, quality, progress_tracker)
                 
                 result = await loop.run_in_executor(
                     executor,
@@ -678,9 +684,12 @@ async def download_playlist_with_progress(request: DownloadRequest) -> Dict[str,
                 # Ejecutar descarga múltiple
                 loop = asyncio.get_event_loop()
                 
+                # Reuse the playlist info fetched above (unless it is only an estimate)
+                known_info = info if "tracks" in info else None
+                
                 def multi_download_wrapper():
                     try:
-                        return multi_downloader.download_multiple(request.url, quality, progress_tracker)
+                        return multi_downloader.download_multiple(request.url, quality, progress_tracker, known_info)
                     except Exception as e:
                         logger.error(f"Error en multi_download_wrapper: {e}")
                         return type('Result', (), {'success': False, 'error': str(e)})()
@@ -752,13 +761,32 @@ async def download_playlist_with_progress(request: DownloadRequest) -> Dict[str,
             detail=f"Error interno del servidor: {str(e)}"
         )
 
+def _scan_audio_files(target_dir: str, folder: str = None) -> List[Dict[str, Any]]:
+    """List audio files in target_dir sorted by name (blocking)."""
+    files = []
+    with os.scandir(target_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            dot = name.rfind(".")
+            if dot >= 0 and name[dot + 1:].lower() in _AUDIO_SUFFIXES and entry.is_file():
+                files.append({
+                    "name": name,
+                    "size": entry.stat().st_size,
+                    "path": entry.path,
+                    "folder": folder
+                })
+    
+    # Ordenar por nombre
+    files.sort(key=itemgetter("name"))
+    return files
+
 @router.get("/list-files")
 async def list_downloaded_files(folder: str = None) -> Dict[str, Any]:
     """
     Listar archivos descargados en una carpeta específica o en el directorio raíz
     """
     try:
-        downloads_dir = downloader.output_dir
+        downloads_dir = get_downloader().output_dir
         
         if folder:
             # Buscar carpeta específica
@@ -766,7 +794,9 @@ async def list_downloaded_files(folder: str = None) -> Dict[str, Any]:
         else:
             target_dir = downloads_dir
             
-        if not os.path.exists(target_dir):
+        try:
+            files = await asyncio.to_thread(_scan_audio_files, target_dir, folder)
+        except FileNotFoundError:
             return {
                 "success": False,
                 "error": f"Folder not found: {folder}",
@@ -774,21 +804,6 @@ async def list_downloaded_files(folder: str = None) -> Dict[str, Any]:
                 "count": 0
             }
         
-        files = []
-        for file_name in os.listdir(target_dir):
-            file_path = os.path.join(target_dir, file_name)
-            if os.path.isfile(file_path) and file_name.endswith(('.mp3', '.wav', '.flac', '.m4a')):
-                file_size = os.path.getsize(file_path)
-                files.append({
-                    "name": file_name,
-                    "size": file_size,
-                    "path": file_path,
-                    "folder": folder
-                })
-        
-        # Ordenar por nombre
-        files.sort(key=lambda x: x["name"])
-        
         return {
             "success": True,
             "files": files,
@@ -811,12 +826,14 @@ async def fix_file_extensions() -> Dict[str, Any]:
     try:
         from ....core.utils import FileUtils
         
-        fixed_count = FileUtils.fix_all_extensions_in_directory(downloader.output_dir)
+        fixed_count = await asyncio.to_thread(
+            FileUtils.fix_all_extensions_in_directory, get_downloader().output_dir
+        )
         
         return {
             "message": f"Extensiones corregidas exitosamente",
             "files_fixed": fixed_count,
-            "directory": downloader.output_dir
+            "directory": get_downloader().output_dir
         }
     except Exception as e:
         logger.error(f"Error corrigiendo extensiones: {e}")
@@ -825,45 +842,38 @@ async def fix_file_extensions() -> Dict[str, Any]:
             detail=f"Error corrigiendo extensiones: {str(e)}"
         )
 
+def _find_playlist_folder(download_dir: Path, download_id: str) -> Optional[Path]:
+    """Return the first folder in download_dir whose name contains download_id (blocking)."""
+    for folder in download_dir.iterdir():
+        if download_id in folder.name and folder.is_dir():
+            return folder
+    return None
+
 @router.get("/download-zip/{download_id}")
 async def download_playlist_zip(download_id: str):
     """
     Descargar todos los archivos de una playlist como ZIP
     """
     try:
-        import zipfile
-        import io
         from fastapi.responses import StreamingResponse
         
-        # Buscar la carpeta de la playlist
-        download_dir = Path(downloader.output_dir)
-        playlist_folders = [
-            f for f in download_dir.iterdir() 
-            if f.is_dir() and download_id in f.name
-        ]
+        # Buscar la carpeta de la playlist (en un thread para no bloquear el event loop)
+        playlist_folder = await asyncio.to_thread(
+            _find_playlist_folder, Path(get_downloader().output_dir), download_id
+        )
         
-        if not playlist_folders:
+        if playlist_folder is None:
             raise HTTPException(
                 status_code=404,
                 detail="Playlist no encontrada o archivos no disponibles"
             )
         
-        playlist_folder = playlist_folders[0]
-        
-        # Crear ZIP en memoria
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for file_path in playlist_folder.glob("*.mp3"):
-                zip_file.write(file_path, file_path.name)
-        
-        zip_buffer.seek(0)
-        
         # Nombre del archivo ZIP
         zip_name = f"{playlist_folder.name}.zip"
         
+        # El ZIP se genera mientras se envía (Starlette itera el generador en un thread)
         return StreamingResponse(
-            io.BytesIO(zip_buffer.read()),
+            FileUtils.iter_zip_archive(playlist_folder.glob("*.mp3")),
             media_type="application/zip",
             headers={"Content-Disposition": f"attachment; filename={zip_name}"}
         )
@@ -881,7 +891,7 @@ async def cleanup_files() -> Dict[str, str]:
     Limpiar archivos temporales
     """
     try:
-        downloader.cleanup()
+        await asyncio.to_thread(get_downloader().cleanup)
         return {"message": "Archivos temporales limpiados exitosamente"}
     except Exception as e:
         logger.error(f"Error limpiando archivos: {e}")
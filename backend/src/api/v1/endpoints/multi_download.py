@@ -5,32 +5,122 @@ Provides Server-Sent Events (SSE) for real-time progress updates during multi-fi
 """
 
 import asyncio
-import json
 import logging
 import time
 import uuid
 import os
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
-from ....services.download_service import downloader, AudioQuality
+from ....services.download_service import AudioQuality
 from ....schemas.models import DownloadRequest
-from ....core.utils import URLValidator, QualityManager
-from .progress import ProgressTracker
+from ....core.utils import URLValidator, QualityManager, FileUtils
+from .progress import ProgressTracker, sse_event
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Global multi-download tracking
-multi_download_store: Dict[str, Dict[str, Any]] = {}
+# Global multi-download tracking (LRU ordered, oldest entries first)
+multi_download_store: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 multi_download_lock = threading.Lock()
 
+# Eviction policy for multi_download_store
+MAX_MULTI_DOWNLOADS = 200  # Max entries kept in memory
+MULTI_DOWNLOAD_TTL = 3600  # Seconds before an untouched entry is reaped (see below)
+REAPER_INTERVAL = 300  # Seconds between reaper passes
+
+def _store_multi_download(download_id: str, data: Dict[str, Any]) -> None:
+    """Write an entry and evict the least recently updated ones. Caller must hold multi_download_lock."""
+    multi_download_store[download_id] = data
+    multi_download_store.move_to_end(download_id)
+    while len(multi_download_store) > MAX_MULTI_DOWNLOADS:
+        multi_download_store.popitem(last=False)
+
+def _has_undelivered_results(data: Dict[str, Any]) -> bool:
+    """Whether an entry holds downloaded files that were not packed into a ZIP yet."""
+    return bool(data.get("files_info")) and "zip_file" not in data
+
+def reap_expired_multi_downloads() -> int:
+    """
+    Remove entries not updated within MULTI_DOWNLOAD_TTL. Returns number of entries removed.
+    
+    Entries with undelivered results are kept, so a client can still fetch
+    its ZIP or file list later; only the MAX_MULTI_DOWNLOADS cap evicts them.
+    """
+    cutoff = time.time() - MULTI_DOWNLOAD_TTL
+    with multi_download_lock:
+        expired = [
+            download_id for download_id, data in multi_download_store.items()
+            if data.get("timestamp", 0) < cutoff and not _has_undelivered_results(data)
+        ]
+        for download_id in expired:
+            del multi_download_store[download_id]
+    return len(expired)
+
+async def run_multi_download_reaper():
+    """Periodically evict stale multi-download entries. Started from the app lifespan (see main.py)."""
+    while True:
+        await asyncio.sleep(REAPER_INTERVAL)
+        try:
+            removed = reap_expired_multi_downloads()
+            if removed:
+                logger.info(f"Reaped {removed} expired multi-download entries")
+        except Exception as e:
+            logger.error(f"Error reaping multi-download store: {e}")
+
+def expand_files_info(files: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """Rebuild the per-file list of dicts from a column snapshot."""
+    return [
+        {
+            "index": index,
+            "name": name,
+            "status": status,
+            "progress": progress,
+            "error": error,
+            "message": message
+        }
+        for index, (name, status, progress, error, message) in enumerate(zip(
+            files.get("name", []), files.get("status", []), files.get("progress", []),
+            files.get("error", []), files.get("message", [])
+        ))
+    ]
+
+def to_progress_response(progress_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a stored snapshot to the client format with a full files_info list."""
+    response = {key: value for key, value in progress_data.items() if key != "files"}
+    if "files" in progress_data:
+        response["files_info"] = expand_files_info(progress_data["files"])
+    return response
+
+def diff_files(previous: Dict[str, Sequence], current: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """List per-file changes between two column snapshots as {"i", "progress", "status"[, "name"]} dicts."""
+    prev_progress = previous.get("progress", [])
+    prev_status = previous.get("status", [])
+    prev_name = previous.get("name", [])
+    names = current.get("name", [])
+    deltas = []
+    
+    for i, (progress, status) in enumerate(zip(current.get("progress", []), current.get("status", []))):
+        name = names[i] if i < len(names) else ""
+        is_new = i >= len(prev_progress)
+        if is_new or progress != prev_progress[i] or status != prev_status[i] or name != prev_name[i]:
+            delta = {"i": i, "progress": progress, "status": status}
+            if is_new or name != prev_name[i]:
+                delta["name"] = name
+            deltas.append(delta)
+    
+    return deltas
+
 class MultiFileProgressTracker:
     """Thread-safe progress tracker for multi-file download operations."""
     
+    # Minimum time between store writes for in-progress file updates
+    MIN_UPDATE_INTERVAL_NS = 100_000_000  # 100 ms
+    
     def __init__(self, download_id: str, total_files: int):
         self.download_id = download_id
         self.total_files = total_files
@@ -40,81 +130,138 @@ class MultiFileProgressTracker:
         self.current_file_progress = 0
         self.current_file_name = ""
         self.current_file_status = "preparing"
-        self.files_info: List[Dict[str, Any]] = []
         self.overall_status = "starting"
         self.error = None
         
+        # Per-file state as parallel columns (struct-of-arrays). Columns are
+        # immutable tuples replaced on write, so published snapshots can share
+        # them without copying.
+        self._name: Tuple[str, ...] = ()
+        self._status: Tuple[str, ...] = ()
+        self._progress: Tuple[int, ...] = ()
+        self._error: Tuple[Optional[str], ...] = ()
+        self._message: Tuple[str, ...] = ()
+        
+        # Throttling of update_current_file: held-back updates by file index,
+        # (file_name, progress, status, message). Guarded by multi_download_lock.
+        self._last_update_ns = 0
+        self._pending_updates: Dict[int, Tuple[str, int, str, str]] = {}
+    
+    @property
+    def files_info(self) -> List[Dict[str, Any]]:
+        """Per-file state as a list of dicts."""
+        with multi_download_lock:
+            return expand_files_info(self.to_snapshot())
+    
+    def to_snapshot(self, full: bool = True) -> Dict[str, tuple]:
+        """
+        Return the per-file columns. Columns are immutable, so no copy is made.
+        
+        A partial snapshot (full=False) only carries progress and status,
+        which is all that changes while files download.
+        """
+        snapshot = {
+            "progress": self._progress,
+            "status": self._status
+        }
+        if full:
+            snapshot["name"] = self._name
+            snapshot["error"] = self._error
+            snapshot["message"] = self._message
+        return snapshot
+    
+    def _ensure_file_slot(self, file_index: int) -> None:
+        """Grow the per-file columns so file_index is addressable."""
+        missing = file_index + 1 - len(self._name)
+        if missing > 0:
+            self._name += ("",) * missing
+            self._status += ("pending",) * missing
+            self._progress += (0,) * missing
+            self._error += (None,) * missing
+            self._message += ("",) * missing
+    
+    def _set_file_field(self, column: str, file_index: int, value: Any) -> None:
+        """Replace one slot of a column, rebuilding the tuple only if the value changed."""
+        values = getattr(self, column)
+        if values[file_index] != value:
+            setattr(self, column, values[:file_index] + (value,) + values[file_index + 1:])
+    
+    def _publish(self, message: str, error: Optional[str]) -> None:
+        """Write the current state to multi_download_store. Caller must hold multi_download_lock."""
+        _store_multi_download(self.download_id, {
+            "download_id": self.download_id,
+            "total_files": self.total_files,
+            "completed_files": self.completed_files,
+            "failed_files": self.failed_files,
+            "current_file_index": self.current_file_index,
+            "current_file_progress": self.current_file_progress,
+            "current_file_name": self.current_file_name,
+            "current_file_status": self.current_file_status,
+            "overall_progress": self._calculate_overall_progress(),
+            "overall_status": self.overall_status,
+            "message": message,
+            "error": error,
+            "files": self.to_snapshot(),
+            "timestamp": time.time()
+        })
+        
+    def _flush_pending_updates(self) -> None:
+        """Apply the throttled file updates that were not published yet. Caller must hold multi_download_lock."""
+        for file_index, update in self._pending_updates.items():
+            self._apply_file_update(file_index, *update)
+        self._pending_updates.clear()
+    
+    def _apply_file_update(self, file_index: int, file_name: str, progress: int, status: str, message: str) -> None:
+        """Record current file state in the tracker. Caller must hold multi_download_lock."""
+        self.current_file_index = file_index
+        self.current_file_name = file_name
+        self.current_file_progress = progress
+        self.current_file_status = status
+        
+        # Update or add file info
+        self._ensure_file_slot(file_index)
+        self._set_file_field("_name", file_index, file_name)
+        self._set_file_field("_status", file_index, status)
+        self._set_file_field("_progress", file_index, progress)
+        self._set_file_field("_error", file_index, None)
+        self._set_file_field("_message", file_index, message)
+    
     def update_overall(self, status: str, message: str = "", error: Optional[str] = None):
         """Update overall download status."""
         with multi_download_lock:
+            self._flush_pending_updates()
             self.overall_status = status
             if error:
                 self.error = error
             
-            multi_download_store[self.download_id] = {
-                "download_id": self.download_id,
-                "total_files": self.total_files,
-                "completed_files": self.completed_files,
-                "failed_files": self.failed_files,
-                "current_file_index": self.current_file_index,
-                "current_file_progress": self.current_file_progress,
-                "current_file_name": self.current_file_name,
-                "current_file_status": self.current_file_status,
-                "overall_progress": self._calculate_overall_progress(),
-                "overall_status": self.overall_status,
-                "message": message,
-                "error": error,
-                "files_info": self.files_info.copy(),
-                "timestamp": time.time()
-            }
+            self._publish(message, error)
     
     def update_current_file(self, file_index: int, file_name: str, progress: int, status: str, message: str = ""):
-        """Update current file progress."""
+        """
+        Update current file progress.
+        
+        In-progress updates arriving less than MIN_UPDATE_INTERVAL_NS after the
+        previous published one are held back; the latest one of each file is
+        applied on the next published update.
+        """
         with multi_download_lock:
-            self.current_file_index = file_index
-            self.current_file_name = file_name
-            self.current_file_progress = progress
-            self.current_file_status = status
-            
-            # Update or add file info
-            while len(self.files_info) <= file_index:
-                self.files_info.append({
-                    "index": len(self.files_info),
-                    "name": "",
-                    "status": "pending",
-                    "progress": 0,
-                    "error": None
-                })
+            now = time.monotonic_ns()
+            if (status == "downloading" and progress < 100
+                    and now - self._last_update_ns < self.MIN_UPDATE_INTERVAL_NS):
+                self._pending_updates[file_index] = (file_name, progress, status, message)
+                return
             
-            self.files_info[file_index] = {
-                "index": file_index,
-                "name": file_name,
-                "status": status,
-                "progress": progress,
-                "error": None,
-                "message": message
-            }
+            self._last_update_ns = now
+            self._pending_updates.pop(file_index, None)
+            self._flush_pending_updates()
+            self._apply_file_update(file_index, file_name, progress, status, message)
             
-            multi_download_store[self.download_id] = {
-                "download_id": self.download_id,
-                "total_files": self.total_files,
-                "completed_files": self.completed_files,
-                "failed_files": self.failed_files,
-                "current_file_index": self.current_file_index,
-                "current_file_progress": self.current_file_progress,
-                "current_file_name": self.current_file_name,
-                "current_file_status": self.current_file_status,
-                "overall_progress": self._calculate_overall_progress(),
-                "overall_status": self.overall_status,
-                "message": f"Descargando {file_name} ({file_index + 1}/{self.total_files})",
-                "error": self.error,
-                "files_info": self.files_info.copy(),
-                "timestamp": time.time()
-            }
+            self._publish(f"Descargando {file_name} ({file_index + 1}/{self.total_files})", self.error)
     
     def complete_file(self, file_index: int, file_name: str, success: bool, error: Optional[str] = None):
         """Mark a file as completed or failed."""
         with multi_download_lock:
+            self._flush_pending_updates()
             if success:
                 self.completed_files += 1
                 status = "completed"
@@ -123,29 +270,14 @@ class MultiFileProgressTracker:
                 status = "failed"
             
             # Update file info
-            if file_index < len(self.files_info):
-                self.files_info[file_index].update({
-                    "status": status,
-                    "progress": 100 if success else 0,
-                    "error": error
-                })
+            self._ensure_file_slot(file_index)
+            if not self._name[file_index]:
+                self._set_file_field("_name", file_index, file_name)
+            self._set_file_field("_status", file_index, status)
+            self._set_file_field("_progress", file_index, 100 if success else 0)
+            self._set_file_field("_error", file_index, error)
             
-            multi_download_store[self.download_id] = {
-                "download_id": self.download_id,
-                "total_files": self.total_files,
-                "completed_files": self.completed_files,
-                "failed_files": self.failed_files,
-                "current_file_index": self.current_file_index,
-                "current_file_progress": self.current_file_progress,
-                "current_file_name": self.current_file_name,
-                "current_file_status": self.current_file_status,
-                "overall_progress": self._calculate_overall_progress(),
-                "overall_status": self.overall_status,
-                "message": f"Completado: {file_name}" if success else f"Error: {file_name}",
-                "error": self.error,
-                "files_info": self.files_info.copy(),
-                "timestamp": time.time()
-            }
+            self._publish(f"Completado: {file_name}" if success else f"Error: {file_name}", self.error)
     
     def _calculate_overall_progress(self) -> int:
         """Calculate overall progress percentage."""
@@ -176,7 +308,7 @@ class MultiFileProgressTracker:
                 "overall_status": "unknown",
                 "message": "Estado desconocido",
                 "error": None,
-                "files_info": [],
+                "files": {},
                 "timestamp": time.time()
             })
     
@@ -206,7 +338,7 @@ async def get_multi_download_progress(download_id: str):
                 detail="Multi-download ID not found"
             )
         
-        return progress_data
+        return to_progress_response(progress_data)
     except Exception as e:
         logger.error(f"Error getting multi-download progress: {e}")
         raise HTTPException(
@@ -219,9 +351,16 @@ async def stream_multi_download_progress(download_id: str):
     """Stream multi-download progress using Server-Sent Events."""
     
     async def generate_multi_progress_stream():
-        """Generate SSE stream for multi-download progress updates."""
+        """
+        Generate SSE stream for multi-download progress updates.
+        
+        The first and last frames are "full" and carry the whole files_info
+        list. Frames in between are "delta" frames: summary fields plus only
+        the files whose progress, status or name changed since the last frame.
+        """
         try:
             last_progress = -1
+            last_files: Dict[str, Sequence] = {}
             max_iterations = 1800  # 30 minutes max (1800 * 1 second)
             iteration = 0
             
@@ -231,30 +370,42 @@ async def stream_multi_download_progress(download_id: str):
                 
                 if not progress_data:
                     # Send completion event if no data found
-                    yield f"data: {json.dumps({'overall_progress': 100, 'overall_status': 'completed', 'message': 'Descarga completada'})}\\n\\n"
+                    yield sse_event({'type': 'full', 'overall_progress': 100, 'overall_status': 'completed', 'message': 'Descarga completada'})
                     break
                 
-                # Only send update if progress changed
-                current_progress = progress_data.get('overall_progress', 0)
-                if current_progress != last_progress or iteration == 0 or iteration % 5 == 0:  # Send every 5 seconds regardless
-                    yield f"data: {json.dumps(progress_data)}\\n\\n"
-                    last_progress = current_progress
-                
                 # Check if download is complete
                 status = progress_data.get('overall_status', '')
                 if status in ['completed', 'success', 'error', 'failed', 'cancelled']:
-                    yield f"data: {json.dumps(progress_data)}\\n\\n"
+                    yield sse_event({'type': 'full', **to_progress_response(progress_data)})
                     break
                 
+                files = progress_data.get('files', {})
+                current_progress = progress_data.get('overall_progress', 0)
+                
+                if iteration == 0:
+                    yield sse_event({'type': 'full', **to_progress_response(progress_data)})
+                    last_progress = current_progress
+                    last_files = files
+                else:
+                    deltas = diff_files(last_files, files)
+                    # Send on changes, and every 5 seconds regardless
+                    if deltas or current_progress != last_progress or iteration % 5 == 0:
+                        frame = {key: value for key, value in progress_data.items() if key != 'files'}
+                        frame['type'] = 'delta'
+                        frame['deltas'] = deltas
+                        yield sse_event(frame)
+                        last_progress = current_progress
+                        last_files = files
+                
                 await asyncio.sleep(1)
                 iteration += 1
             
             if iteration >= max_iterations:
-                yield f"data: {json.dumps({'overall_progress': 0, 'overall_status': 'timeout', 'message': 'Descarga excedió tiempo límite'})}\\n\\n"
+                yield sse_event({'type': 'full', 'overall_progress': 0, 'overall_status': 'timeout', 'message': 'Descarga excedió tiempo límite'})
                 
         except Exception as e:
             logger.error(f"Error in multi-progress stream: {e}")
-            yield f"data: {json.dumps({'overall_progress': 0, 'overall_status': 'error', 'message': f'Error en stream: {str(e)}'})}\\n\\n"
+            yield sse_event({'type': 'full', 'overall_progress': 0, 'overall_status': 'error', 'message': f'Error en stream: {str(e)}'})
     
     return StreamingResponse(
         generate_multi_progress_stream(),
@@ -262,7 +413,6 @@ async def stream_multi_download_progress(download_id: str):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
         }
     )
 
@@ -336,7 +486,9 @@ async def create_playlist_zip(download_id: str):
         
         # Create ZIP file
         playlist_name = playlist_info.get("title", f"Playlist_{download_id}")
-        zip_path = multi_downloader.create_playlist_zip(files_info, playlist_name)
+        zip_path = await asyncio.to_thread(
+            multi_downloader.create_playlist_zip, files_info, playlist_name
+        )
         
         if not zip_path:
             raise HTTPException(
@@ -348,11 +500,13 @@ async def create_playlist_zip(download_id: str):
         with multi_download_lock:
             multi_download_store[download_id]["zip_file"] = zip_path
         
+        file_size = await asyncio.to_thread(FileUtils.get_file_size, zip_path)
+        
         return {
             "success": True,
             "zip_file": zip_path,
             "download_url": f"/api/download-file/{os.path.basename(zip_path)}",
-            "file_size": os.path.getsize(zip_path) if os.path.exists(zip_path) else 0,
+            "file_size": file_size,
             "message": "ZIP file created successfully"
         }
         
@@ -392,7 +546,7 @@ async def cleanup_playlist_files(download_id: str, keep_zip: bool = True):
         from ....services.playlist_service import multi_downloader
         
         # Clean up files
-        cleaned_count = multi_downloader.cleanup_after_zip(files_info, keep_zip)
+        cleaned_count = await asyncio.to_thread(multi_downloader.cleanup_after_zip, files_info, keep_zip)
         
         return {
             "success": True,
@@ -436,7 +590,7 @@ async def move_files_external(download_id: str, external_dir: str):
         from ....services.playlist_service import multi_downloader
         
         # Move files
-        moved_files = multi_downloader.move_files_to_external(files_info, external_dir)
+        moved_files = await asyncio.to_thread(multi_downloader.move_files_to_external, files_info, external_dir)
         
         return {
             "success": True,
@@ -515,7 +669,9 @@ async def auto_cleanup_after_download(download_id: str):
         from ....services.playlist_service import multi_downloader
         
         # Create ZIP
-        zip_path = multi_downloader.create_playlist_zip(files_info, playlist_name)
+        zip_path = await asyncio.to_thread(
+            multi_downloader.create_playlist_zip, files_info, playlist_name
+        )
         
         if zip_path:
             # Update download info with ZIP path
@@ -523,7 +679,7 @@ async def auto_cleanup_after_download(download_id: str):
                 multi_download_store[download_id]["zip_file"] = zip_path
             
             # Cleanup individual files (keep ZIP)
-            cleaned_count = multi_downloader.cleanup_after_zip(files_info, keep_zip=True)
+            cleaned_count = await asyncio.to_thread(multi_downloader.cleanup_after_zip, files_info, keep_zip=True)
             
             return {
                 "success": True,
@@ -5,22 +5,114 @@ Provides Server-Sent Events (SSE) for real-time progress updates during download
 """
 
 import asyncio
-import json
 import logging
 import time
 import uuid
-from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Optional, Set, Tuple
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from concurrent.futures import ThreadPoolExecutor
 import threading
+from collections import OrderedDict
+import orjson
+
+from ....core.config import settings
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Handlers and SSE generators in this module are `async def` and run on the
+# event loop: they must only do dict lookups and cheap serialization. Anything
+# that blocks (disk, subprocesses, heavy CPU) goes through asyncio.to_thread,
+# otherwise every open progress stream stalls with it.
+
+# Global progress tracking (LRU ordered, least recently updated first).
+# Entries are immutable snapshots: writers build a new dict and swap it in with
+# a single assignment (atomic under the GIL), so readers never take a lock.
+progress_store: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# Serializes writers, which also reorder and evict entries; readers don't take it
+progress_store_lock = threading.Lock()
+
+# Eviction policy for progress_store
+MAX_PROGRESS_ENTRIES = 10_000  # Hard cap on entries kept in memory
+SWEEPER_INTERVAL = 300  # Seconds between TTL sweeps
+
+# IDs of downloads not yet in a terminal status
+_active: Set[str] = set()
+TERMINAL_STATUSES = frozenset({'completed', 'success', 'error', 'failed', 'cancelled'})
+
+# SSE subscribers waiting for progress changes, keyed by download_id
+progress_subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+subscribers_lock = threading.Lock()
+
+def _store_progress(download_id: str, data: Dict[str, Any]) -> None:
+    """Swap in a new snapshot and evict the least recently updated entries over the cap."""
+    with progress_store_lock:
+        progress_store[download_id] = data
+        progress_store.move_to_end(download_id)
+        while len(progress_store) > MAX_PROGRESS_ENTRIES:
+            evicted_id, _ = progress_store.popitem(last=False)
+            _active.discard(evicted_id)
+
+def _remove_progress(download_id: str) -> Optional[Dict[str, Any]]:
+    """Remove an entry and return it, or None if there was none."""
+    with progress_store_lock:
+        return progress_store.pop(download_id, None)
+
+def sweep_progress_store() -> int:
+    """Remove terminal entries older than keep_files_hours. Returns number of entries removed."""
+    cutoff = time.time() - settings.keep_files_hours * 3600
+    with progress_store_lock:
+        expired = [
+            download_id for download_id, data in progress_store.items()
+            if data.get("status") in TERMINAL_STATUSES and data.get("timestamp", 0) < cutoff
+        ]
+        for download_id in expired:
+            del progress_store[download_id]
+    return len(expired)
+
+async def run_progress_sweeper():
+    """Periodically evict expired progress entries. Started from the app lifespan (see main.py)."""
+    while True:
+        await asyncio.sleep(SWEEPER_INTERVAL)
+        try:
+            removed = sweep_progress_store()
+            if removed:
+                logger.info("Swept %s expired progress entries", removed)
+        except Exception as e:
+            logger.error("Error sweeping progress store: %s", e)
+
+# Seconds without updates before the SSE stream sends a keep-alive comment
+KEEPALIVE_INTERVAL = 15
+
+def sse_event(payload: Any) -> bytes:
+    """Encode a payload as an SSE data frame."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+def notify_progress(download_id: str) -> None:
+    """Wake SSE streams subscribed to download_id. Safe to call from any thread."""
+    with subscribers_lock:
+        subscribers = list(progress_subscribers.get(download_id, ()))
+    for loop, event in subscribers:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # Event loop already closed
+            pass
 
-# Global progress tracking
-progress_store: Dict[str, Dict[str, Any]] = {}
-progress_lock = threading.Lock()
+def _subscribe(download_id: str, subscriber: Tuple[asyncio.AbstractEventLoop, asyncio.Event]) -> None:
+    """Register an SSE stream for progress notifications."""
+    with subscribers_lock:
+        progress_subscribers.setdefault(download_id, set()).add(subscriber)
+
+def _unsubscribe(download_id: str, subscriber: Tuple[asyncio.AbstractEventLoop, asyncio.Event]) -> None:
+    """Remove an SSE stream from progress notifications."""
+    with subscribers_lock:
+        subscribers = progress_subscribers.get(download_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del progress_subscribers[download_id]
 
 class ProgressTracker:
     """Thread-safe progress tracker for download operations."""
@@ -35,16 +127,20 @@ class ProgressTracker:
         
     def update(self, progress: int, status: str, message: str, error: Optional[str] = None, filename: Optional[str] = None):
         """Update progress information."""
-        with progress_lock:
-            progress_store[self.download_id] = {
-                "progress": progress,
-                "status": status,
-                "message": message,
-                "error": error,
-                "filename": filename,
-                "timestamp": time.time(),
-                "cancelled": self._cancelled
-            }
+        _store_progress(self.download_id, {
+            "progress": progress,
+            "status": status,
+            "message": message,
+            "error": error,
+            "filename": filename,
+            "timestamp": time.time(),
+            "cancelled": self._cancelled
+        })
+        if status in TERMINAL_STATUSES:
+            _active.discard(self.download_id)
+        else:
+            _active.add(self.download_id)
+        notify_progress(self.download_id)
     
     def cancel(self):
         """Mark download as cancelled."""
@@ -57,39 +153,47 @@ class ProgressTracker:
     
     def get_progress(self) -> Dict[str, Any]:
         """Get current progress information."""
-        with progress_lock:
-            return progress_store.get(self.download_id, {
-                "progress": 0,
-                "status": "unknown",
-                "message": "Estado desconocido",
-                "error": None
-            })
+        return progress_store.get(self.download_id, {
+            "progress": 0,
+            "status": "unknown",
+            "message": "Estado desconocido",
+            "error": None
+        })
     
     def cleanup(self):
         """Clean up progress data."""
-        with progress_lock:
-            if self.download_id in progress_store:
-                del progress_store[self.download_id]
+        _remove_progress(self.download_id)
+        _active.discard(self.download_id)
+        notify_progress(self.download_id)
+
+def _init_progress(download_id: str) -> None:
+    """Write the initial progress entry for a new download."""
+    _store_progress(download_id, {
+        "progress": 0,
+        "status": "created",
+        "message": "Descarga creada",
+        "error": None,
+        "filename": None,
+        "timestamp": time.time(),
+        "cancelled": False
+    })
+    _active.add(download_id)
 
 def create_progress_tracker() -> str:
-    """Create a new progress tracker and return its ID."""
+    """Create a new progress entry and return its ID."""
     download_id = str(uuid.uuid4())
-    tracker = ProgressTracker(download_id)
-    tracker.update(0, "created", "Descarga creada")
+    _init_progress(download_id)
     return download_id
 
-def get_progress_tracker(download_id: str) -> Optional[ProgressTracker]:
-    """Get existing progress tracker."""
-    if download_id in progress_store:
-        return ProgressTracker(download_id)
-    return None
+def get_progress_tracker(download_id: str) -> Optional[Dict[str, Any]]:
+    """Get the current progress snapshot of a download, if it exists."""
+    return progress_store.get(download_id)
 
 @router.get("/progress/{download_id}")
 async def get_download_progress(download_id: str):
     """Get current progress for a download."""
     try:
-        with progress_lock:
-            progress_data = progress_store.get(download_id)
+        progress_data = progress_store.get(download_id)
         
         if not progress_data:
             raise HTTPException(
@@ -97,75 +201,97 @@ async def get_download_progress(download_id: str):
                 detail="Download ID not found"
             )
         
-        return progress_data
+        return ORJSONResponse(progress_data)
     except Exception as e:
-        logger.error(f"Error getting progress: {e}")
+        logger.error("Error getting progress: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error getting progress: {str(e)}"
         )
 
 @router.get("/progress-stream/{download_id}")
-async def stream_download_progress(download_id: str):
+async def stream_download_progress(download_id: str, request: Request):
     """Stream download progress using Server-Sent Events."""
     
     async def generate_progress_stream():
-        """Generate SSE stream for progress updates."""
+        """
+        Generate SSE stream for progress updates.
+        
+        Waits for notify_progress() instead of polling, and sends a keep-alive
+        comment when no update arrives within KEEPALIVE_INTERVAL seconds.
+        The stream ends on a terminal status, when the entry disappears from
+        the store, or as soon as the client disconnects.
+        """
+        event = asyncio.Event()
+        subscriber = (asyncio.get_running_loop(), event)
+        _subscribe(download_id, subscriber)
         try:
             last_progress = -1
-            max_iterations = 600  # 10 minutes max (600 * 1 second)
-            iteration = 0
+            first_frame = True
             
-            while iteration < max_iterations:
-                with progress_lock:
-                    progress_data = progress_store.get(download_id)
+            while True:
+                event.clear()
+                progress_data = progress_store.get(download_id)
                 
                 if not progress_data:
                     # Send completion event if no data found
-                    yield f"data: {json.dumps({'progress': 100, 'status': 'completed', 'message': 'Descarga completada'})}\n\n"
+                    yield sse_event({'progress': 100, 'status': 'completed', 'message': 'Descarga completada'})
                     break
                 
                 # Only send update if progress changed
                 current_progress = progress_data.get('progress', 0)
-                if current_progress != last_progress or iteration == 0:
-                    yield f"data: {json.dumps(progress_data)}\n\n"
+                if current_progress != last_progress or first_frame:
+                    yield sse_event(progress_data)
                     last_progress = current_progress
+                    first_frame = False
                 
                 # Check if download is complete or failed
                 status = progress_data.get('status', '')
                 if status in ['completed', 'success']:
                     # Add download URL to completed progress
-                    progress_data['download_url'] = f"/api/v1/download-zip/{download_id}"
-                    progress_data['ready_for_download'] = True
-                    yield f"data: {json.dumps(progress_data)}\n\n"
+                    progress_data = {
+                        **progress_data,
+                        'download_url': f"/api/v1/download-zip/{download_id}",
+                        'ready_for_download': True
+                    }
+                    yield sse_event(progress_data)
                     break
-                elif status in ['error', 'failed']:
+                elif status in TERMINAL_STATUSES:
                     break
                 
-                await asyncio.sleep(1)  # Update every second
-                iteration += 1
+                # Wait for the next update
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": ping\n\n"
+                    continue
+                
+                if await request.is_disconnected():
+                    return
             
             # Send final completion event
-            yield f"data: {json.dumps({'progress': 100, 'status': 'stream_ended', 'message': 'Stream finalizado'})}\n\n"
+            yield sse_event({'progress': 100, 'status': 'stream_ended', 'message': 'Stream finalizado'})
             
         except Exception as e:
-            logger.error(f"Error in progress stream: {e}")
+            logger.error("Error in progress stream: %s", e)
             error_data = {
                 'progress': 0,
                 'status': 'error',
                 'message': f'Error en stream: {str(e)}',
                 'error': str(e)
             }
-            yield f"data: {json.dumps(error_data)}\n\n"
+            yield sse_event(error_data)
+        finally:
+            _unsubscribe(download_id, subscriber)
     
     return StreamingResponse(
         generate_progress_stream(),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control"
+            "Connection": "keep-alive"
         }
     )
 
@@ -173,19 +299,18 @@ async def stream_download_progress(download_id: str):
 async def cleanup_progress(download_id: str):
     """Clean up progress data for a download."""
     try:
-        with progress_lock:
-            if download_id in progress_store:
-                del progress_store[download_id]
-                return {"message": "Progress data cleaned up"}
-            else:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Download ID not found"
-                )
+        if _remove_progress(download_id) is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Download ID not found"
+            )
+        _active.discard(download_id)
+        notify_progress(download_id)
+        return {"message": "Progress data cleaned up"}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error cleaning up progress: {e}")
+        logger.error("Error cleaning up progress: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error cleaning up progress: {str(e)}"
@@ -195,18 +320,18 @@ async def cleanup_progress(download_id: str):
 async def get_active_downloads():
     """Get list of active downloads."""
     try:
-        with progress_lock:
-            active_downloads = {
-                download_id: data for download_id, data in progress_store.items()
-                if data.get('status') not in ['completed', 'success', 'error', 'failed', 'cancelled']
-            }
+        active_downloads = {}
+        for download_id in list(_active):
+            data = progress_store.get(download_id)
+            if data is not None:
+                active_downloads[download_id] = data
         
-        return {
+        return ORJSONResponse({
             "active_downloads": active_downloads,
             "count": len(active_downloads)
-        }
+        })
     except Exception as e:
-        logger.error(f"Error getting active downloads: {e}")
+        logger.error("Error getting active downloads: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error getting active downloads: {str(e)}"
@@ -216,24 +341,28 @@ async def get_active_downloads():
 async def cancel_download(download_id: str):
     """Cancel a download operation."""
     try:
-        with progress_lock:
-            if download_id in progress_store:
-                # Mark as cancelled in the store
-                progress_store[download_id]["status"] = "cancelled"
-                progress_store[download_id]["message"] = "Descarga cancelada"
-                progress_store[download_id]["cancelled"] = True
-                
-                logger.info(f"Download {download_id} marked as cancelled")
-                return {"success": True, "message": "Descarga cancelada"}
-            else:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Download {download_id} not found"
-                )
+        progress_data = progress_store.get(download_id)
+        if progress_data is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Download {download_id} not found"
+            )
+        # Mark as cancelled with a new snapshot
+        _store_progress(download_id, {
+            **progress_data,
+            "status": "cancelled",
+            "message": "Descarga cancelada",
+            "cancelled": True
+        })
+        _active.discard(download_id)
+        
+        notify_progress(download_id)
+        logger.info("Download %s marked as cancelled", download_id)
+        return ORJSONResponse({"success": True, "message": "Descarga cancelada"})
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error cancelling download: {e}")
+        logger.error("Error cancelling download: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Error cancelling download: {str(e)}"
@@ -4,11 +4,14 @@ API Router v1
 Main router for API version 1 endpoints.
 """
 
+import asyncio
+
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from .endpoints import download, multi_download, progress
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # Include all endpoint routers
 api_router.include_router(
@@ -33,7 +36,7 @@ api_router.include_router(
 @api_router.get("/health")
 async def health_check():
     """Health check endpoint for backward compatibility."""
-    from src.services.download_service import DownloadService
+    from src.services.download_service import download_service
     
-    service = DownloadService()
-    return service.health_check()
\ No newline at end of file
+    # Runs the spotdl subprocess probe; keep it off the event loop
+    return await asyncio.to_thread(download_service.health_check)
\ No newline at end of file
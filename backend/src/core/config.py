@@ -14,13 +14,22 @@ class Settings(BaseSettings):
     default_output_dir: str = os.getenv("OUTPUT_DIR", "./downloads")
     downloads_dir: str = os.getenv("DOWNLOADS_DIR", "./downloads")
     external_storage_dir: str = os.getenv("EXTERNAL_STORAGE_DIR", "../external_downloads")
+    cache_dir: str = os.getenv("CACHE_DIR", os.path.expanduser("~/.cache/localsongs"))
     max_file_size_mb: int = 100
+    max_concurrent_downloads: int = 4  # Parallel downloads in batch mode
+    
+    # Process-wide DNS answer cache (opt-in; pins every lookup for the TTL)
+    dns_cache_enabled: bool = False
+    dns_cache_ttl: int = 300  # Seconds
     allowed_formats: list = ["mp3", "wav", "flac"]
     
     # Cleanup configuration
     auto_cleanup_after_zip: bool = True
     keep_files_hours: int = 24  # Mantener archivos por 24 horas
     
+    # CORS configuration (frontend origins allowed to call the API)
+    cors_origins: list = ["http://localhost:3000", "http://127.0.0.1:3000"]
+    
     # Default quality configuration
     default_quality: str = "192"  # kbps
     
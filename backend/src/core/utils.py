@@ -1,11 +1,20 @@
+import errno
+import io
 import re
 import os
 import hashlib
+import heapq
 import zipfile
 import tempfile
 import shutil
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Iterable, Iterator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,49 +22,39 @@ logger = logging.getLogger(__name__)
 class URLValidator:
     """URL validator for different platforms."""
     
+    # re.match only anchors at the start, so trailing query strings
+    # (?si=..., &list=...) need no separate patterns.
     SPOTIFY_PATTERNS = [
-        r'https?://open\.spotify\.com/(track|album|playlist)/([a-zA-Z0-9]+)',
-        r'https?://open\.spotify\.com/(track|album|playlist)/([a-zA-Z0-9]+)\?.*',  # With parameters
-        r'https?://open\.spotify\.com/intl-[a-z]{2}/(track|album|playlist)/([a-zA-Z0-9]+)',  # International URLs
-        r'https?://open\.spotify\.com/intl-[a-z]{2}/(track|album|playlist)/([a-zA-Z0-9]+)\?.*',  # International with parameters
-        r'spotify:(track|album|playlist):([a-zA-Z0-9]+)'
+        r'https?://open\.spotify\.com/(?:intl-[a-z]{2}/)?(?:track|album|playlist)/[a-zA-Z0-9]+',  # Including international URLs
+        r'spotify:(?:track|album|playlist):[a-zA-Z0-9]+'
     ]
     
     YOUTUBE_PATTERNS = [
-        r'https?://(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        r'https?://(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)&.*',  # With additional parameters
-        r'https?://youtu\.be/([a-zA-Z0-9_-]+)',
-        r'https?://youtu\.be/([a-zA-Z0-9_-]+)\?.*',  # With parameters like ?si=
-        r'https?://(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]+)',
-        r'https?://music\.youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        r'https?://music\.youtube\.com/watch\?v=([a-zA-Z0-9_-]+)&.*',  # YouTube Music with parameters
-        r'https?://music\.youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)',
-        r'https?://music\.youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)&.*',  # YouTube Music playlist with parameters
+        r'https?://(?:www\.|m\.)?youtube\.com/watch\?v=[a-zA-Z0-9_-]+',
+        r'https?://(?:m\.)?youtu\.be/[a-zA-Z0-9_-]+',
+        r'https?://(?:www\.)?youtube\.com/embed/[a-zA-Z0-9_-]+',
+        r'https?://music\.youtube\.com/watch\?v=[a-zA-Z0-9_-]+',
+        r'https?://music\.youtube\.com/playlist\?list=[a-zA-Z0-9_-]+',
         # YouTube Playlists
-        r'https?://(?:www\.)?youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)',
-        r'https?://(?:www\.)?youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)&.*',  # With parameters
+        r'https?://(?:www\.)?youtube\.com/playlist\?list=[a-zA-Z0-9_-]+',
         # Additional YouTube URL formats
-        r'https?://(?:www\.)?youtube\.com/v/([a-zA-Z0-9_-]+)',
-        r'https?://(?:www\.)?youtube\.com/user/[^/]+/watch\?v=([a-zA-Z0-9_-]+)',
-        r'https?://(?:m\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        r'https?://(?:m\.)?youtu\.be/([a-zA-Z0-9_-]+)',
+        r'https?://(?:www\.)?youtube\.com/v/[a-zA-Z0-9_-]+',
+        r'https?://(?:www\.)?youtube\.com/user/[^/]+/watch\?v=[a-zA-Z0-9_-]+',
     ]
     
+    # Each platform's patterns compiled into one alternation
+    _SPOTIFY_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in SPOTIFY_PATTERNS))
+    _YOUTUBE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in YOUTUBE_PATTERNS))
+    
     @staticmethod
     def is_valid_spotify_url(url: str) -> bool:
         """Validate if it's a valid Spotify URL."""
-        logger.info(f"Validating Spotify URL: {url}")
-        for pattern in URLValidator.SPOTIFY_PATTERNS:
-            if re.match(pattern, url):
-                logger.info(f"Valid Spotify URL with pattern: {pattern}")
-                return True
-        logger.warning(f"Invalid Spotify URL: {url}")
-        return False
+        return URLValidator._SPOTIFY_RE.match(url) is not None
     
     @staticmethod
     def is_valid_youtube_url(url: str) -> bool:
         """Validate if it's a valid YouTube URL."""
-        return any(re.match(pattern, url) for pattern in URLValidator.YOUTUBE_PATTERNS)
+        return URLValidator._YOUTUBE_RE.match(url) is not None
     
     @staticmethod
     def clean_youtube_url(url: str) -> str:
@@ -95,49 +94,101 @@ class URLValidator:
             return url
             
         except Exception as e:
-            logger.warning(f"Error cleaning YouTube URL {url}: {e}")
+            logger.warning("Error cleaning YouTube URL %s: %s", url, e)
             return url
     
     @staticmethod
     def is_valid_url(url: str) -> Tuple[bool, Optional[str]]:
         """Validate URL and return platform type."""
-        logger.info(f"Validating URL: {url}")
-        
         if URLValidator.is_valid_spotify_url(url):
-            logger.info("Detected as Spotify")
             return True, "spotify"
         elif URLValidator.is_valid_youtube_url(url):
             if "music.youtube.com" in url:
-                logger.info("Detected as YouTube Music")
                 return True, "youtube_music"
             else:
-                logger.info("Detected as YouTube")
                 return True, "youtube"
         
-        logger.warning(f"Invalid or unsupported URL: {url}")
+        logger.warning("Invalid or unsupported URL: %s", url)
         return False, None
 
+class _ZipStreamSink(io.RawIOBase):
+    """Non-seekable write target that queues ZIP output until it is drained."""
+    
+    def __init__(self):
+        self._chunks = deque()
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> Iterator[bytes]:
+        """Yield and discard everything written so far."""
+        while self._chunks:
+            yield self._chunks.popleft()
+
 class FileUtils:
     """File handling utilities."""
     
+    # Audio extensions written to ZIPs without compression
+    STORED_AUDIO_EXTENSIONS = ('.mp3', '.m4a', '.flac', '.ogg', '.wav', '.aac', '.opus')
+    
+    # Every character matched by \s (str.isspace), including NBSP and the
+    # Unicode space separators common in YouTube titles
+    _WHITESPACE_CHARS = (
+        '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f\x85\xa0\u1680'
+        '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+        '\u2028\u2029\u202f\u205f\u3000'
+    )
+    
+    # Single pass for filename cleanup: characters not allowed in filenames
+    # become '_', other problematic ones are spelled out and whitespace
+    # becomes plain spaces
+    _FILENAME_TABLE = str.maketrans({
+        **{char: '_' for char in '<>:"/\\|?*'},
+        **{char: ' ' for char in _WHITESPACE_CHARS},
+        '&': 'and',
+        '#': 'No',
+        '@': 'at',
+        '%': 'percent',
+    })
+    # Runs of spaces, dashes or underscores
+    _REPEATED_SEPARATORS_RE = re.compile(r'([-_ ])\1+')
+    
+    # Extra information commonly found in YouTube titles:
+    # (Official Video), [Official Audio], (Audio), (Video), (Lyrics), (Lyric Video),
+    # (HD), (4K), (Remastered), (2023), ... in parentheses or brackets
+    _TITLE_NOISE_RE = re.compile(
+        r'\((?:Official[^)]*|Audio|Video|Lyric[^)]*|HD|4K|Remaster[^)]*|\d{4})\)'
+        r'|\[(?:Official[^\]]*|Audio|Video|Lyric[^\]]*|HD|4K|Remaster[^\]]*|\d{4})\]',
+        re.IGNORECASE
+    )
+    _WHITESPACE_RE = re.compile(r'\s+')
+    
+    # Problematic extensions left by some downloads, and their fixes
+    _PROBLEMATIC_EXTENSIONS = {
+        ".mp3_": ".mp3",
+        ".m4a_": ".m4a",
+        ".wav_": ".wav",
+        ".flac_": ".flac",
+        ".ogg_": ".ogg"
+    }
+    
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Sanitize filename."""
-        # Remove invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Remove additional special characters that can cause problems
-        filename = filename.replace('&', 'and')
-        filename = filename.replace('#', 'No')
-        filename = filename.replace('@', 'at')
-        filename = filename.replace('%', 'percent')
-        
-        # Remove multiple spaces and dashes
-        filename = re.sub(r'\s+', ' ', filename)  # Multiple spaces to one
-        filename = re.sub(r'-+', '-', filename)   # Multiple dashes to one
-        filename = re.sub(r'_+', '_', filename)   # Multiple underscores to one
+        # Replace invalid and problematic characters
+        filename = filename.translate(FileUtils._FILENAME_TABLE)
+        
+        # Collapse multiple spaces, dashes and underscores to one
+        filename = FileUtils._REPEATED_SEPARATORS_RE.sub(r'\1', filename)
         
         # Limit length
         if len(filename) > 200:
@@ -148,34 +199,11 @@ class FileUtils:
     @staticmethod
     def format_song_title(title: str, artist: str = None, album: str = None) -> str:
         """Format song title in a cleaner way."""
-        # Clean title
-        clean_title = title
-        
         # Remove common extra information in YouTube titles
-        patterns_to_remove = [
-            r'\(Official.*?\)',  # (Official Video), (Official Audio), etc.
-            r'\[Official.*?\]',  # [Official Video], [Official Audio], etc.
-            r'\(Audio\)',        # (Audio)
-            r'\[Audio\]',        # [Audio]
-            r'\(Video\)',        # (Video)
-            r'\[Video\]',        # [Video]
-            r'\(Lyric.*?\)',     # (Lyrics), (Lyric Video), etc.
-            r'\[Lyric.*?\]',     # [Lyrics], [Lyric Video], etc.
-            r'\(HD\)',           # (HD)
-            r'\[HD\]',           # [HD]
-            r'\(4K\)',           # (4K)
-            r'\[4K\]',           # [4K]
-            r'\(Remaster.*?\)',  # (Remastered), etc.
-            r'\[Remaster.*?\]',  # [Remastered], etc.
-            r'\(\d{4}\)',        # (2023), (2024), etc.
-            r'\[\d{4}\]',        # [2023], [2024], etc.
-        ]
-        
-        for pattern in patterns_to_remove:
-            clean_title = re.sub(pattern, '', clean_title, flags=re.IGNORECASE)
+        clean_title = FileUtils._TITLE_NOISE_RE.sub('', title)
         
         # Clean extra spaces
-        clean_title = re.sub(r'\s+', ' ', clean_title).strip()
+        clean_title = FileUtils._WHITESPACE_RE.sub(' ', clean_title).strip()
         
         # If we have artist, try to remove it from title if duplicated
         if artist:
@@ -218,59 +246,73 @@ class FileUtils:
     @staticmethod
     def clean_file_extension(file_path: str) -> str:
         """Clean problematic extensions like .mp3_ -> .mp3."""
-        if not os.path.exists(file_path):
-            logger.warning(f"File does not exist: {file_path}")
+        base, bad_ext = os.path.splitext(file_path)
+        good_ext = FileUtils._PROBLEMATIC_EXTENSIONS.get(bad_ext)
+        if good_ext is None:
             return file_path
-            
-        # Lista de extensiones problemáticas a corregir
-        problematic_extensions = {
-            ".mp3_": ".mp3",
-            ".m4a_": ".m4a",
-            ".wav_": ".wav",
-            ".flac_": ".flac",
-            ".ogg_": ".ogg"
-        }
-        
-        for bad_ext, good_ext in problematic_extensions.items():
-            if file_path.endswith(bad_ext):
-                new_path = file_path.replace(bad_ext, good_ext)
-                try:
-                    # Verificar que el archivo destino no exista
-                    if os.path.exists(new_path):
-                        # Si existe, agregar un sufijo único
-                        base, ext = os.path.splitext(new_path)
-                        counter = 1
-                        while os.path.exists(f"{base}_{counter}{ext}"):
-                            counter += 1
-                        new_path = f"{base}_{counter}{ext}"
-                    
-                    os.rename(file_path, new_path)
-                    logger.info(f"Extension corrected: {os.path.basename(file_path)} -> {os.path.basename(new_path)}")
-                    return new_path
-                except OSError as e:
-                    logger.error(f"Error correcting extension from {file_path} to {new_path}: {e}")
-                    return file_path
         
-        return file_path
+        new_path = base + good_ext
+        counter = 0
+        while True:
+            try:
+                FileUtils._rename_no_replace(file_path, new_path)
+                break
+            except FileExistsError:
+                # Si el destino existe, agregar un sufijo único
+                counter += 1
+                new_path = f"{base}_{counter}{good_ext}"
+            except FileNotFoundError:
+                logger.warning("File does not exist: %s", file_path)
+                return file_path
+            except OSError as e:
+                logger.error("Error correcting extension from %s to %s: %s", file_path, new_path, e)
+                return file_path
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Extension corrected: %s -> %s", os.path.basename(file_path), os.path.basename(new_path))
+        return new_path
+    
+    @staticmethod
+    def _rename_no_replace(src: str, dst: str) -> None:
+        """
+        Rename src to dst, raising FileExistsError instead of overwriting dst.
+        
+        Uses link + unlink so the existence check and the rename are a single
+        atomic step; falls back to a checked os.rename where hard links are
+        not supported.
+        """
+        try:
+            os.link(src, dst)
+        except (FileExistsError, FileNotFoundError):
+            raise
+        except OSError:
+            if os.path.lexists(dst):
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+            os.rename(src, dst)
+            return
+        os.unlink(src)
     
     @staticmethod
     def fix_all_extensions_in_directory(directory: str) -> int:
         """Fix all problematic extensions in a directory. Returns number of files fixed."""
         fixed_count = 0
         try:
-            if not os.path.exists(directory):
-                return 0
-                
-            for filename in os.listdir(directory):
-                file_path = os.path.join(directory, filename)
-                if os.path.isfile(file_path):
-                    original_path = file_path
-                    fixed_path = FileUtils.clean_file_extension(file_path)
-                    if fixed_path != original_path:
-                        fixed_count += 1
+            with os.scandir(directory) as entries:
+                # Only files with a problematic suffix need a rename
+                candidates = [
+                    entry.path for entry in entries
+                    if os.path.splitext(entry.name)[1] in FileUtils._PROBLEMATIC_EXTENSIONS
+                    and entry.is_file()
+                ]
+            
+            for file_path in candidates:
+                if FileUtils.clean_file_extension(file_path) != file_path:
+                    fixed_count += 1
                         
+        except FileNotFoundError:
+            return 0
         except Exception as e:
-            logger.error(f"Error fixing extensions in directory {directory}: {e}")
+            logger.error("Error fixing extensions in directory %s: %s", directory, e)
             
         return fixed_count
 
@@ -278,23 +320,46 @@ class FileUtils:
     def get_file_size(file_path: str) -> int:
         """Get file size in bytes."""
         try:
-            return os.path.getsize(file_path)
+            return os.stat(file_path).st_size
         except OSError:
             return 0
     
+    @staticmethod
+    def get_file_identity(file_path: str) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get a cheap identity key for a file: (device, inode, size, mtime_ns).
+        
+        Answers "is this the same, unchanged file?" from metadata alone; use
+        get_file_hash only when the content itself has to be compared.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    
     @staticmethod
     def get_file_hash(file_path: str) -> str:
-        """Get MD5 hash of file."""
+        """Get SHA-256 hash of file."""
         try:
-            hash_md5 = hashlib.md5()
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+                # Streams the file through OpenSSL (SHA-NI where available)
+                return hashlib.file_digest(f, "sha256").hexdigest()
         except Exception as e:
-            logger.error(f"Error calculating hash: {e}")
+            logger.error("Error calculating hash: %s", e)
             return ""
     
+    @staticmethod
+    def get_file_size_and_identity(file_path: str) -> Tuple[int, str]:
+        """
+        Get the size and the identity key (see get_file_identity) of a file as a
+        "dev-ino-size-mtime_ns" string, from a single stat; (0, "") on error.
+        """
+        identity = FileUtils.get_file_identity(file_path)
+        if identity is None:
+            return 0, ""
+        return identity[2], "-".join(map(str, identity))
+    
     @staticmethod
     def ensure_directory(path: str) -> None:
         """Ensure directory exists."""
@@ -304,31 +369,31 @@ class FileUtils:
     def clean_directory(path: str, keep_files: int = 10) -> None:
         """Clean directory keeping only the most recent files."""
         try:
-            if not os.path.exists(path):
-                return
+            with os.scandir(path) as entries:
+                files = [
+                    (entry.path, entry.stat().st_mtime)
+                    for entry in entries if entry.is_file(follow_symlinks=False)
+                ]
             
-            files = []
-            for file in os.listdir(path):
-                file_path = os.path.join(path, file)
-                if os.path.isfile(file_path):
-                    files.append((file_path, os.path.getmtime(file_path)))
-            
-            # Sort by modification date (most recent first)
-            files.sort(key=lambda x: x[1], reverse=True)
+            # Select the oldest files beyond the keep_files most recent ones
+            old_files = heapq.nsmallest(max(len(files) - keep_files, 0), files, key=itemgetter(1))
             
             # Remove old files
-            for file_path, _ in files[keep_files:]:
+            for file_path, _ in old_files:
                 try:
                     os.remove(file_path)
-                    logger.info(f"File deleted: {file_path}")
+                    logger.info("File deleted: %s", file_path)
                 except Exception as e:
-                    logger.error(f"Error deleting file {file_path}: {e}")
+                    logger.error("Error deleting file %s: %s", file_path, e)
                     
+        except FileNotFoundError:
+            return
         except Exception as e:
-            logger.error(f"Error cleaning directory {path}: {e}")
+            logger.error("Error cleaning directory %s: %s", path, e)
     
     @staticmethod
-    def create_zip_archive(file_paths: List[str], zip_name: str, output_dir: str) -> Optional[str]:
+    def create_zip_archive(file_paths: List[str], zip_name: str, output_dir: str,
+                           compress_type: Optional[int] = None) -> Optional[str]:
         """
         Create a ZIP archive from a list of files.
         
@@ -336,6 +401,7 @@ class FileUtils:
             file_paths: List of full paths to files to include
             zip_name: Name for the ZIP file (without extension)
             output_dir: Directory where to save the ZIP
+            compress_type: Compression for every file (default: chosen per file)
             
         Returns:
             Full path to created ZIP file or None if failed
@@ -346,28 +412,112 @@ class FileUtils:
             zip_filename = f"{safe_zip_name}.zip"
             zip_path = os.path.join(output_dir, zip_filename)
             
-            # Create ZIP archive
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in file_paths:
-                    if os.path.exists(file_path):
-                        # Use just the filename in the archive (no directory structure)
-                        arcname = os.path.basename(file_path)
-                        zipf.write(file_path, arcname)
-                        logger.info(f"Added to ZIP: {arcname}")
-                    else:
-                        logger.warning(f"File not found for ZIP: {file_path}")
+            # Create ZIP archive (files are read in parallel, written in order)
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
+                added = FileUtils.write_zip_entries(zipf, file_paths, compress_type)
             
             if os.path.exists(zip_path):
-                logger.info(f"ZIP created successfully: {zip_path}")
+                logger.info("ZIP created successfully with %s files: %s", added, zip_path)
                 return zip_path
             else:
                 logger.error("ZIP file was not created")
                 return None
                 
         except Exception as e:
-            logger.error(f"Error creating ZIP archive: {e}")
+            logger.error("Error creating ZIP archive: %s", e)
             return None
     
+    @staticmethod
+    def get_zip_compress_type(file_path: str) -> int:
+        """Store already-compressed audio as-is; DEFLATE gains almost nothing on it."""
+        if file_path.lower().endswith(FileUtils.STORED_AUDIO_EXTENSIONS):
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+    
+    @staticmethod
+    def _prepare_zip_entry(file_path: str, compress_type: Optional[int]) -> Optional[Tuple[zipfile.ZipInfo, bytes]]:
+        """Read a file and build its ZIP header. Returns None if the file is missing."""
+        try:
+            zinfo = zipfile.ZipInfo.from_file(file_path, os.path.basename(file_path))
+            if compress_type is None:
+                compress_type = FileUtils.get_zip_compress_type(file_path)
+            zinfo.compress_type = compress_type
+            with open(file_path, "rb") as f:
+                return zinfo, f.read()
+        except FileNotFoundError:
+            logger.warning("File not found for ZIP: %s", file_path)
+            return None
+    
+    @staticmethod
+    def write_zip_entries(zipf: zipfile.ZipFile, file_paths: Iterable[str],
+                          compress_type: Optional[int] = None,
+                          max_workers: Optional[int] = None) -> int:
+        """
+        Add files to an open ZIP, reading them in parallel.
+        
+        Files are read by a thread pool while the calling thread appends the
+        entries to the archive in submission order. At most 2 * max_workers
+        files are held in memory at once. Without an explicit compress_type,
+        each file's is chosen by get_zip_compress_type.
+        
+        Returns:
+            Number of files added
+        """
+        max_workers = max_workers or os.cpu_count() or 4
+        added = 0
+        
+        def append(future):
+            nonlocal added
+            entry = future.result()
+            if entry is None:
+                return
+            zinfo, data = entry
+            zipf.writestr(zinfo, data)
+            added += 1
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = deque()
+            for file_path in file_paths:
+                pending.append(pool.submit(FileUtils._prepare_zip_entry, str(file_path), compress_type))
+                if len(pending) >= max_workers * 2:
+                    append(pending.popleft())
+            while pending:
+                append(pending.popleft())
+        
+        return added
+    
+    @staticmethod
+    def iter_zip_archive(file_paths: Iterable[str], chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """
+        Build a ZIP archive on the fly and yield its bytes as they are produced.
+        
+        Nothing is written to disk and memory use stays around chunk_size, so
+        the archive can be streamed straight into an HTTP response.
+        
+        Args:
+            file_paths: Paths of the files to include (missing files are skipped)
+            chunk_size: Bytes read from each source file at a time
+        """
+        sink = _ZipStreamSink()
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
+            for file_path in file_paths:
+                file_path = str(file_path)
+                try:
+                    zinfo = zipfile.ZipInfo.from_file(file_path, os.path.basename(file_path))
+                    source = open(file_path, "rb")
+                except FileNotFoundError:
+                    logger.warning("File not found for ZIP: %s", file_path)
+                    continue
+                zinfo.compress_type = FileUtils.get_zip_compress_type(file_path)
+                
+                with source, zipf.open(zinfo, 'w') as entry:
+                    while chunk := source.read(chunk_size):
+                        entry.write(chunk)
+                        yield from sink.drain()
+                yield from sink.drain()
+        # Central directory, written when the archive is closed
+        yield from sink.drain()
+    
     @staticmethod
     def cleanup_files(file_paths: List[str], keep_zip: bool = True) -> int:
         """
@@ -383,21 +533,71 @@ class FileUtils:
         deleted_count = 0
         
         for file_path in file_paths:
+            # Skip ZIP files if keep_zip is True
+            if keep_zip and file_path.endswith('.zip'):
+                continue
+            
             try:
-                if os.path.exists(file_path):
-                    # Skip ZIP files if keep_zip is True
-                    if keep_zip and file_path.endswith('.zip'):
-                        continue
-                        
-                    os.remove(file_path)
-                    deleted_count += 1
-                    logger.info(f"Cleaned up file: {file_path}")
-                    
+                os.remove(file_path)
+                deleted_count += 1
+                logger.info("Cleaned up file: %s", file_path)
+            except FileNotFoundError:
+                # Already gone; one failed unlink instead of a stat per file
+                pass
             except Exception as e:
-                logger.error(f"Error deleting file {file_path}: {e}")
+                logger.error("Error deleting file %s: %s", file_path, e)
         
         return deleted_count
     
+    @staticmethod
+    def move_file(src: str, dst: str, try_rename: bool = True) -> bool:
+        """
+        Move a file, renaming in place when possible.
+        
+        os.replace is a single atomic syscall on the same filesystem; only
+        cross-device moves fall back to copy + delete. The copy stays in the
+        kernel: copy_file_range (reflinks on btrfs/XFS) where supported,
+        otherwise shutil.copyfile (sendfile on Linux). Pass try_rename=False
+        when the move is already known to cross devices.
+        
+        Returns:
+            True if the file was renamed in place, False if it was copied
+        """
+        if try_rename:
+            try:
+                os.replace(src, dst)
+                return True
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        if not FileUtils._copy_file_range(src, dst):
+            shutil.copyfile(src, dst)
+        shutil.copystat(src, dst)
+        os.remove(src)
+        return False
+    
+    @staticmethod
+    def _copy_file_range(src: str, dst: str) -> bool:
+        """Copy src to dst with os.copy_file_range; False if it can't be used here."""
+        if not hasattr(os, "copy_file_range"):
+            return False
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if not copied:
+                        return False
+                    remaining -= copied
+            return True
+        except OSError as e:
+            # Unsupported between these filesystems
+            if e.errno in (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                return False
+            raise
+    
     @staticmethod
     def move_files_to_external_dir(file_paths: List[str], external_dir: str) -> List[str]:
         """
@@ -416,28 +616,38 @@ class FileUtils:
             # Ensure external directory exists
             FileUtils.ensure_directory(external_dir)
             
+            # Names already taken in the destination, read once
+            existing_names = set(os.listdir(external_dir))
+            
+            # Cleared by the first cross-device move, so later files skip the rename attempt
+            same_device = True
+            
             for file_path in file_paths:
-                if os.path.exists(file_path):
-                    filename = os.path.basename(file_path)
-                    new_path = os.path.join(external_dir, filename)
-                    
-                    # Handle name conflicts
-                    counter = 1
-                    base_name, ext = os.path.splitext(filename)
-                    while os.path.exists(new_path):
-                        new_filename = f"{base_name}_{counter}{ext}"
-                        new_path = os.path.join(external_dir, new_filename)
-                        counter += 1
-                    
-                    try:
-                        shutil.move(file_path, new_path)
-                        moved_files.append(new_path)
-                        logger.info(f"Moved file: {file_path} -> {new_path}")
-                    except Exception as e:
-                        logger.error(f"Error moving file {file_path}: {e}")
+                filename = os.path.basename(file_path)
+                
+                # Handle name conflicts
+                new_filename = filename
+                counter = 1
+                base_name, ext = os.path.splitext(filename)
+                while new_filename in existing_names:
+                    new_filename = f"{base_name}_{counter}{ext}"
+                    counter += 1
+                new_path = os.path.join(external_dir, new_filename)
+                
+                try:
+                    same_device = FileUtils.move_file(file_path, new_path, same_device)
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    logger.error("Error moving file %s: %s", file_path, e)
+                    continue
+                
+                existing_names.add(new_filename)
+                moved_files.append(new_path)
+                logger.info("Moved file: %s -> %s", file_path, new_path)
                         
         except Exception as e:
-            logger.error(f"Error setting up external directory {external_dir}: {e}")
+            logger.error("Error setting up external directory %s: %s", external_dir, e)
         
         return moved_files
 
@@ -490,4 +700,43 @@ class ErrorHandler:
     @staticmethod
     def get_error_message(error_code: str, default: str = "Unknown error") -> str:
         """Get custom error message."""
-        return ErrorHandler.ERROR_MESSAGES.get(error_code, default)
\ No newline at end of file
+        return ErrorHandler.ERROR_MESSAGES.get(error_code, default)
+
+def install_dns_cache(ttl: float = 900, maxsize: int = 512) -> None:
+    """
+    Cache socket.getaddrinfo results process-wide.
+    
+    yt-dlp and spotdl resolve the same few hosts (youtube.com, *.googlevideo.com,
+    ...) for every request and fragment; cached answers are reused for ttl
+    seconds, keeping at most maxsize entries. Failed lookups are not cached.
+    Calling it more than once has no effect.
+    
+    Every lookup in the process is cached, ignoring real record TTLs, so this
+    is only installed when settings.dns_cache_enabled is set (see main.py).
+    """
+    if getattr(socket.getaddrinfo, "_dns_cache", False):
+        return
+    
+    resolve = socket.getaddrinfo
+    cache: "OrderedDict[tuple, Tuple[float, list]]" = OrderedDict()
+    lock = threading.Lock()
+    
+    def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with lock:
+            entry = cache.get(key)
+            if entry is not None and entry[0] > now:
+                cache.move_to_end(key)
+                return list(entry[1])
+        
+        result = resolve(host, port, family, type, proto, flags)
+        with lock:
+            cache[key] = (now + ttl, result)
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+        return list(result)
+    
+    getaddrinfo._dns_cache = True
+    socket.getaddrinfo = getaddrinfo
@@ -6,21 +6,156 @@ high-quality audio extraction and consistent file naming.
 """
 
 import os
+import json
+import asyncio
+import urllib.parse
+import urllib.request
 import tempfile
 import shutil
 import subprocess
 import logging
-from typing import Optional, Dict, Any
+import time
+import functools
+import importlib.metadata
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Final, Mapping, ClassVar, TYPE_CHECKING
 from pathlib import Path
 from enum import Enum
 
-import yt_dlp
-
 from ..core.utils import URLValidator, FileUtils, QualityManager, ErrorHandler
 from ..core.config import settings
 
+if TYPE_CHECKING:
+    import yt_dlp
+
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
+def get_spotdl_version() -> Optional[str]:
+    """
+    Return the installed spotdl version, or None if spotdl is unavailable.
+    
+    Reads the package metadata in-process; only when spotdl is not installed
+    as a package does it fall back to running `spotdl --version`. The result
+    is cached for the lifetime of the process.
+    """
+    try:
+        return importlib.metadata.version("spotdl")
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    
+    try:
+        # Check if we're in a uv environment
+        if os.environ.get('VIRTUAL_ENV') or os.environ.get('UV_PROJECT_ENVIRONMENT'):
+            cmd = ['uv', 'run', 'spotdl', '--version']
+        else:
+            cmd = ['spotdl', '--version']
+        
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+        if result.returncode == 0:
+            return result.stdout.strip() or "unknown"
+    except Exception:
+        pass
+    return None
+
+_spotify_client_lock = threading.Lock()
+_spotify_client_ready: Optional[bool] = None
+
+def init_spotify_client() -> bool:
+    """
+    Initialize spotdl's process-wide Spotify client, once.
+    
+    Uses spotdl's public credentials, like the spotdl command line. Returns
+    False when the spotdl library cannot be used in-process, in which case
+    callers fall back to running the spotdl command.
+    """
+    global _spotify_client_ready
+    with _spotify_client_lock:
+        if _spotify_client_ready is None:
+            try:
+                from spotdl.utils.config import DEFAULT_CONFIG
+                from spotdl.utils.spotify import SpotifyClient
+                
+                SpotifyClient.init(
+                    client_id=DEFAULT_CONFIG["client_id"],
+                    client_secret=DEFAULT_CONFIG["client_secret"],
+                    user_auth=False,
+                    no_cache=True
+                )
+                _spotify_client_ready = True
+            except Exception as e:
+                logger.warning(f"spotdl library unavailable, using the spotdl command: {e}")
+                _spotify_client_ready = False
+        return _spotify_client_ready
+
+def search_spotify_tracks(url: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Resolve the tracks of a Spotify URL in-process with the spotdl library.
+    
+    Returns the tracks in the same shape as a `spotdl save` file, or None
+    if the library cannot be used and the spotdl command is needed instead.
+    """
+    if not init_spotify_client():
+        return None
+    
+    try:
+        from spotdl.utils.search import parse_query
+        
+        return [song.json for song in parse_query([url])]
+    except Exception as e:
+        logger.warning(f"spotdl library lookup failed, using the spotdl command: {e}")
+        return None
+
+# yt-dlp options to pull one video over several connections: fragments
+# (DASH/HLS) are fetched in parallel, and plain HTTP downloads go through
+# aria2c with multiple connections when it is installed.
+PARALLEL_DOWNLOAD_OPTS: Dict[str, Any] = {'concurrent_fragment_downloads': 4}
+if shutil.which('aria2c'):
+    PARALLEL_DOWNLOAD_OPTS.update({
+        'external_downloader': {'default': 'aria2c'},
+        'external_downloader_args': {'aria2c': ['-x', '8', '-s', '8', '-k', '1M']},
+    })
+
+# Headers sent with every yt-dlp request, to avoid blocks
+HTTP_HEADERS: Final[Mapping[str, str]] = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
+YOUTUBE_OEMBED_URL: Final = "https://www.youtube.com/oembed"
+SPOTIFY_OEMBED_URL: Final = "https://open.spotify.com/oembed"
+
+
+def fetch_oembed(endpoint: str, url: str, timeout: float = 5) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the oEmbed document of a URL (title, author, thumbnail).
+    
+    A single small JSON request, much cheaper than running an extractor.
+    Returns None if the provider does not answer with valid JSON.
+    """
+    query = urllib.parse.urlencode({"url": url, "format": "json"})
+    try:
+        with urllib.request.urlopen(f"{endpoint}?{query}", timeout=timeout) as response:
+            return json.loads(response.read())
+    except (OSError, ValueError) as e:
+        logger.warning(f"oEmbed lookup failed for {url}: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def spotify_oembed(url: str) -> Mapping[str, Any]:
+    """
+    Get the oEmbed document of a Spotify URL (title, thumbnail), cached per URL.
+    
+    Raises LookupError when the lookup fails, so failures are not cached.
+    """
+    data = fetch_oembed(SPOTIFY_OEMBED_URL, url, timeout=3)
+    if not data:
+        raise LookupError(f"No oEmbed data for {url}")
+    return MappingProxyType(data)
+
+
 class AudioQuality(Enum):
     """Audio quality options with corresponding bitrates."""
     LOW = "96"      # 96 kbps
@@ -36,6 +171,14 @@ class Platform(Enum):
     YOUTUBE_MUSIC = "youtube_music"
 
 
+# URLValidator platform names to Platform members
+_PLATFORM_MAP: Final[Mapping[str, Platform]] = MappingProxyType({
+    "spotify": Platform.SPOTIFY,
+    "youtube": Platform.YOUTUBE,
+    "youtube_music": Platform.YOUTUBE_MUSIC
+})
+
+
 class DownloadResult:
     """Container for download operation results."""
     
@@ -63,11 +206,76 @@ class MusicDownloader:
     - Comprehensive error handling and logging
     """
     
+    # Background cleanup of output_dir: keep this many recent files, and only
+    # run once more than CLEANUP_FILE_THRESHOLD files may have piled up and
+    # CLEANUP_MIN_INTERVAL seconds have passed since the last run
+    CLEANUP_KEEP_FILES = 20
+    CLEANUP_FILE_THRESHOLD = 25
+    CLEANUP_MIN_INTERVAL = 60
+    
+    # yt-dlp options for metadata-only extraction (get_audio_info)
+    INFO_YDL_OPTS = {
+        'quiet': False,
+        'no_warnings': False,
+        'socket_timeout': 15,  # Shorter timeout for info
+        'retries': 2,
+        'http_headers': HTTP_HEADERS
+    }
+    
+    # Static yt-dlp options of download_from_youtube; each call adds its
+    # output template, postprocessors and hooks
+    _BASE_YDL_OPTS: ClassVar[Mapping[str, Any]] = MappingProxyType({
+        'format': 'bestaudio/best',
+        'postprocessor_args': [
+            '-ar', '44100',  # Sample rate
+        ],
+        'prefer_ffmpeg': True,
+        'keepvideo': False,
+        'quiet': False,  # Changed to see more information
+        'no_warnings': False,  # Changed for debugging
+        # Timeout and network configurations
+        'socket_timeout': 30,  # Socket timeout
+        'fragment_retries': 3,  # Fragment retries
+        'retries': 3,  # General retries
+        'file_access_retries': 3,  # File access retries
+        'http_chunk_size': 10485760,  # 10MB chunks (non-fragmented formats)
+        **PARALLEL_DOWNLOAD_OPTS,
+        # Additional configurations to avoid hangs
+        'extractor_retries': 3,
+        'writesubtitles': False,
+        'writeautomaticsub': False,
+        'writedescription': False,
+        'writeinfojson': False,
+        'writethumbnail': False,
+        'http_headers': HTTP_HEADERS
+    })
+    
+    # Minimum seconds between download progress updates (5 Hz)
+    PROGRESS_UPDATE_INTERVAL = 0.2
+    
+    # Overall seconds health_check waits for its probes
+    HEALTH_PROBE_TIMEOUT = 5
+    
+    # Concurrent get_audio_info_async lookups
+    INFO_MAX_CONCURRENCY = 8
+    
     def __init__(self, output_dir: Optional[str] = None):
         """Initialize downloader with output directory and spotdl configuration."""
         self.output_dir = output_dir or settings.default_output_dir
         FileUtils.ensure_directory(self.output_dir)
         
+        # Per-thread YoutubeDL instances, reused across calls
+        self._ydl_local = threading.local()
+        
+        # Limits concurrent get_audio_info_async lookups
+        self._info_semaphore = asyncio.Semaphore(self.INFO_MAX_CONCURRENCY)
+        
+        # Estimated files in output_dir; unknown at start, so the first
+        # download always triggers a cleanup
+        self._file_count_hint = self.CLEANUP_FILE_THRESHOLD + 1
+        self._last_cleanup_ts = float('-inf')
+        self._cleanup_lock = threading.Lock()
+        
         # Setup spotdl
         self._setup_spotdl()
         
@@ -77,7 +285,7 @@ class MusicDownloader:
             # SpotDL can work without credentials for many functions
             # using YouTube as audio source
             logger.info("Configuring SpotDL in public mode (no credentials)")
-            self.spotdl_available = True
+            self.spotdl_available = get_spotdl_version() is not None
         except Exception as e:
             logger.error(f"Error configuring spotdl: {e}")
             self.spotdl_available = False
@@ -89,13 +297,21 @@ class MusicDownloader:
         if not is_valid:
             raise ValueError(ErrorHandler.get_error_message("invalid_url"))
         
-        platform_map = {
-            "spotify": Platform.SPOTIFY,
-            "youtube": Platform.YOUTUBE,
-            "youtube_music": Platform.YOUTUBE_MUSIC
-        }
+        return _PLATFORM_MAP[platform_type]
+    
+    def _get_info_ydl(self) -> "yt_dlp.YoutubeDL":
+        """
+        Get this thread's metadata-only YoutubeDL, creating it on first use.
         
-        return platform_map[platform_type]
+        Reusing it keeps extractors, cookies and HTTP sessions warm between
+        get_audio_info calls. YoutubeDL is not thread-safe, hence one per thread.
+        """
+        ydl = getattr(self._ydl_local, 'info_ydl', None)
+        if ydl is None:
+            import yt_dlp
+            ydl = yt_dlp.YoutubeDL(dict(self.INFO_YDL_OPTS))
+            self._ydl_local.info_ydl = ydl
+        return ydl
     
     def _get_output_filename(self, title: str, artist: str, quality: str) -> str:
         """Generate output filename with proper formatting."""
@@ -153,6 +369,8 @@ class MusicDownloader:
             DownloadResult with success status, file path, and metadata
         """
         try:
+            import yt_dlp
+            
             # Clean URL to extract only individual video (remove playlist params)
             from ..core.utils import URLValidator
             cleaned_url = URLValidator.clean_youtube_url(url)
@@ -171,81 +389,88 @@ class MusicDownloader:
             
             logger.info(f"Downloading from YouTube: {url} with quality {quality.value}")
             
-            # Temporary name to avoid conflicts
-            temp_template = os.path.join(self.output_dir, 'temp_%(title)s.%(ext)s')
+            # Temporary name, unique per video, to avoid conflicts
+            temp_template = os.path.join(self.output_dir, 'temp_%(id)s.%(ext)s')
+            
+            # Progress hook for yt-dlp. It fires on every downloaded chunk, so
+            # tracker updates are limited to PROGRESS_UPDATE_INTERVAL and to
+            # actual changes in the reported progress
+            last_update = 0.0
+            last_progress = -1
             
-            # Progress hook for yt-dlp
             def progress_hook(d):
+                nonlocal last_update, last_progress
                 if progress_tracker and d['status'] == 'downloading':
+                    now = time.monotonic()
+                    if now - last_update < self.PROGRESS_UPDATE_INTERVAL:
+                        return
+                    last_update = now
+                    
                     # Check for cancellation before updating progress
                     if hasattr(progress_tracker, 'is_cancelled') and progress_tracker.is_cancelled():
                         raise Exception("Descarga cancelada por el usuario")
-                        
-                    if 'total_bytes' in d and d['total_bytes']:
-                        downloaded = d.get('downloaded_bytes', 0)
-                        total = d['total_bytes']
-                        percentage = int((downloaded / total) * 60) + 10  # 10-70% for download
-                        progress_tracker.update(percentage, "downloading", f"Descargando: {percentage-10}/60%")
+                    
+                    total = d.get('total_bytes') or d.get('total_bytes_estimate')
+                    if total:
+                        percentage = int((d.get('downloaded_bytes', 0) / total) * 60) + 10  # 10-70% for download
+                        if percentage != last_progress:
+                            last_progress = percentage
+                            progress_tracker.update(percentage, "downloading", f"Descargando: {percentage-10}/60%")
                     elif '_percent_str' in d:
                         # Fallback to yt-dlp's percentage string
                         percent_str = d['_percent_str'].strip().replace('%', '')
                         try:
                             percent = int(float(percent_str))
                             progress = min(int(percent * 0.6) + 10, 70)  # Scale to 10-70%
-                            progress_tracker.update(progress, "downloading", f"Descargando: {percent}%")
+                            if progress != last_progress:
+                                last_progress = progress
+                                progress_tracker.update(progress, "downloading", f"Descargando: {percent}%")
                         except:
                             pass
                 elif progress_tracker and d['status'] == 'finished':
                     progress_tracker.update(70, "converting", "Convirtiendo a MP3...")
-
+            
+            # Runs once the video is extracted, right before its download starts
+            def log_video_info(info_dict, *, incomplete=False):
+                if not incomplete:
+                    duration = info_dict.get('duration') or 0
+                    logger.info(f"Video found: '{info_dict.get('title', 'Unknown')}' by {info_dict.get('uploader', 'Unknown')} ({duration}s)")
+                    
+                    # Check if video is too long (more than 20 minutes)
+                    if duration > 1200:  # 20 minutes
+                        logger.warning(f"Very long video ({duration}s), this may take time...")
+                return None  # Never skip the video
+            
             # Configure yt-dlp options with timeouts and best settings
             ydl_opts = {
-                'format': 'bestaudio/best',
+                **self._BASE_YDL_OPTS,
                 'outtmpl': temp_template,
                 'postprocessors': [{
                     'key': 'FFmpegExtractAudio',
                     'preferredcodec': 'mp3',
                     'preferredquality': quality.value,
                 }],
-                'postprocessor_args': [
-                    '-ar', '44100',  # Sample rate
-                ],
-                'prefer_ffmpeg': True,
-                'keepvideo': False,
-                'quiet': False,  # Changed to see more information
-                'no_warnings': False,  # Changed for debugging
                 'progress_hooks': [progress_hook],  # Add progress hook
-                # Timeout and network configurations
-                'socket_timeout': 30,  # Socket timeout
-                'fragment_retries': 3,  # Fragment retries
-                'retries': 3,  # General retries
-                'file_access_retries': 3,  # File access retries
-                'http_chunk_size': 10485760,  # 10MB chunks
-                # Additional configurations to avoid hangs
-                'extractor_retries': 3,
-                'writesubtitles': False,
-                'writeautomaticsub': False,
-                'writedescription': False,
-                'writeinfojson': False,
-                'writethumbnail': False,
-                # Headers to avoid blocks
-                'http_headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
+                'match_filter': log_video_info,
             }
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                logger.info("Extracting video information...")
-                # Get video information with timeout
+                # Extract and download in a single extractor run
+                logger.info("Extracting video information and downloading...")
                 try:
-                    info = ydl.extract_info(url, download=False)
+                    info = ydl.extract_info(url, download=True)
+                    logger.info("Download completed")
                 except Exception as e:
-                    logger.error(f"Error extracting information: {e}")
+                    logger.error(f"Error during download: {e}")
                     return DownloadResult(
                         success=False,
-                        error=f"Error getting video information: {str(e)}"
+                        error=f"Error during download: {str(e)}"
                     )
                 
+                # Single-video playlists report the video as their only entry
+                if info and info.get('entries'):
+                    info = next((entry for entry in info['entries'] if entry), None)
+                
                 if not info:
                     return DownloadResult(
                         success=False,
@@ -254,40 +479,16 @@ class MusicDownloader:
                 
                 title = info.get('title', 'Unknown')
                 uploader = info.get('uploader', 'Unknown')
-                duration = info.get('duration', 0)
-                
-                logger.info(f"Video found: '{title}' by {uploader} ({duration}s)")
-                
-                # Check if video is too long (more than 20 minutes)
-                if duration and duration > 1200:  # 20 minutes
-                    logger.warning(f"Very long video ({duration}s), this may take time...")
-                
-                # Download with improved error handling
-                logger.info("Starting download...")
-                try:
-                    ydl.download([url])
-                    logger.info("Download completed")
-                except Exception as e:
-                    logger.error(f"Error during download: {e}")
-                    return DownloadResult(
-                        success=False,
-                        error=f"Error during download: {str(e)}"
-                    )
                 
                 # Update progress
                 if progress_tracker:
                     progress_tracker.update(85, "finalizing", "Finalizando descarga...")
                 
-                # Find downloaded file and rename it
-                temp_file = None
-                for file in os.listdir(self.output_dir):
-                    if file.startswith('temp_') and (file.endswith('.mp3') or file.endswith('.mp3_')):
-                        temp_file = os.path.join(self.output_dir, file)
-                        # Clean problematic extension if exists
-                        temp_file = FileUtils.clean_file_extension(temp_file)
-                        break
+                # Converted file as reported by yt-dlp (updated by the postprocessors)
+                requested = info.get('requested_downloads') or [{}]
+                temp_file = requested[0].get('filepath')
                 
-                if not temp_file or not os.path.exists(temp_file):
+                if not temp_file:
                     return DownloadResult(
                         success=False,
                         error="Downloaded file not found"
@@ -298,25 +499,20 @@ class MusicDownloader:
                 final_path = os.path.join(self.output_dir, final_filename)
                 
                 try:
-                    os.rename(temp_file, final_path)
+                    os.replace(temp_file, final_path)
                     file_path = final_path
                     logger.info(f"File renamed to: {final_filename}")
+                except FileNotFoundError:
+                    return DownloadResult(
+                        success=False,
+                        error="Downloaded file not found"
+                    )
                 except OSError as e:
                     logger.warning(f"Could not rename file: {e}")
                     file_path = temp_file
                 
                 file_size = FileUtils.get_file_size(file_path)
-                
-                metadata = {
-                    "title": title,
-                    "artist": uploader,
-                    "duration": info.get('duration', 0),
-                    "quality": quality.value,
-                    "view_count": info.get('view_count', 0),
-                    "upload_date": info.get('upload_date', ''),
-                    "platform": "youtube_music" if "music.youtube.com" in url else "youtube",
-                    "file_hash": FileUtils.get_file_hash(file_path)
-                }
+                metadata = self._build_youtube_metadata(info, url, quality, file_path)
                 
                 # Update progress - completed
                 filename = os.path.basename(file_path)
@@ -334,6 +530,20 @@ class MusicDownloader:
             logger.error(f"Error downloading from YouTube: {e}")
             return DownloadResult(success=False, error=str(e))
     
+    def _build_youtube_metadata(self, info: Dict[str, Any], url: str, quality: AudioQuality, file_path: str) -> Dict[str, Any]:
+        """Build the metadata dict of a downloaded YouTube track."""
+        return {
+            "title": info.get('title', 'Unknown'),
+            "artist": info.get('uploader', 'Unknown'),
+            "duration": info.get('duration', 0),
+            "quality": quality.value,
+            "view_count": info.get('view_count', 0),
+            "upload_date": info.get('upload_date', ''),
+            "platform": "youtube_music" if "music.youtube.com" in url else "youtube",
+            # Identifies the file from its metadata, without reading it
+            "file_hash": FileUtils.get_file_size_and_identity(file_path)[1]
+        }
+    
     def download_audio(self, url: str, quality: AudioQuality = AudioQuality.HIGH, progress_tracker=None) -> DownloadResult:
         """Main method to download audio from any supported platform."""
         try:
@@ -356,8 +566,8 @@ class MusicDownloader:
             platform = self.detect_platform(url)
             logger.info(f"Platform detected: {platform.value}")
             
-            # Clean directory if there are too many files
-            FileUtils.clean_directory(self.output_dir, keep_files=20)
+            # Clean directory in the background if there may be too many files
+            self._schedule_cleanup()
             
             # Download according to platform
             if platform == Platform.SPOTIFY:
@@ -365,12 +575,16 @@ class MusicDownloader:
                 result = self.download_from_spotify(url, quality, progress_tracker)
                 if not result.success:
                     logger.error(f"Spotify download failed: {result.error}")
+                else:
+                    self._count_new_file()
                 return result
             elif platform in [Platform.YOUTUBE, Platform.YOUTUBE_MUSIC]:
                 logger.info(f"Processing YouTube URL: {url}")
                 result = self.download_from_youtube(url, quality, progress_tracker)
                 if not result.success:
                     logger.error(f"YouTube download failed: {result.error}")
+                else:
+                    self._count_new_file()
                 return result
             else:
                 return DownloadResult(
@@ -384,6 +598,28 @@ class MusicDownloader:
             logger.error(f"General download error: {e}")
             return DownloadResult(success=False, error=str(e))
     
+    def _count_new_file(self) -> None:
+        """Record a new file in output_dir for the cleanup threshold."""
+        with self._cleanup_lock:
+            self._file_count_hint += 1
+    
+    def _schedule_cleanup(self) -> None:
+        """Clean output_dir in a background thread when enough files may have piled up."""
+        now = time.monotonic()
+        with self._cleanup_lock:
+            if (self._file_count_hint <= self.CLEANUP_FILE_THRESHOLD
+                    or now - self._last_cleanup_ts < self.CLEANUP_MIN_INTERVAL):
+                return
+            self._last_cleanup_ts = now
+            self._file_count_hint = self.CLEANUP_KEEP_FILES
+        
+        threading.Thread(
+            target=FileUtils.clean_directory,
+            args=(self.output_dir, self.CLEANUP_KEEP_FILES),
+            name="output-dir-cleanup",
+            daemon=True
+        ).start()
+    
     def get_audio_info(self, url: str) -> Dict[str, Any]:
         """Get audio information without downloading it."""
         try:
@@ -395,8 +631,22 @@ class MusicDownloader:
                 if not self.spotdl_available:
                     return {"error": "SpotDL is not available"}
                 
-                # For Spotify, for now we return basic information
-                # since the meta API has changed
+                try:
+                    data = spotify_oembed(url)
+                    return {
+                        "success": True,
+                        "title": data.get('title', 'Spotify Track'),
+                        "artist": "Spotify Artist",
+                        "album": "Unknown",
+                        "duration": 0,
+                        "platform": "spotify",
+                        "thumbnail_url": data.get('thumbnail_url', ''),
+                        "note": "Complete information available after download"
+                    }
+                except LookupError:
+                    pass
+                
+                # oEmbed unavailable, return basic information
                 return {
                     "success": True,
                     "title": "Spotify Track",
@@ -408,33 +658,23 @@ class MusicDownloader:
                 }
             
             elif platform_type in ["youtube", "youtube_music"]:
-                ydl_opts = {
-                    'quiet': False, 
-                    'no_warnings': False,
-                    'socket_timeout': 15,  # Shorter timeout for info
-                    'retries': 2,
-                    'http_headers': {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    }
-                }
-                
                 try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        logger.info(f"Getting information from: {url}")
-                        info = ydl.extract_info(url, download=False)
-                        
-                        if not info:
-                            return {"error": "Could not get video information"}
-                        
-                        return {
-                            "success": True,
-                            "title": info.get('title', 'Unknown'),
-                            "artist": info.get('uploader', 'Unknown'),
-                            "duration": info.get('duration', 0),
-                            "view_count": info.get('view_count', 0),
-                            "platform": platform_type,
-                            "thumbnail_url": info.get('thumbnail', '')
-                        }
+                    ydl = self._get_info_ydl()
+                    logger.info(f"Getting information from: {url}")
+                    info = ydl.extract_info(url, download=False)
+                    
+                    if not info:
+                        return {"error": "Could not get video information"}
+                    
+                    return {
+                        "success": True,
+                        "title": info.get('title', 'Unknown'),
+                        "artist": info.get('uploader', 'Unknown'),
+                        "duration": info.get('duration', 0),
+                        "view_count": info.get('view_count', 0),
+                        "platform": platform_type,
+                        "thumbnail_url": info.get('thumbnail', '')
+                    }
                 except Exception as e:
                     logger.error(f"Error getting YouTube info: {e}")
                     return {"error": f"Error getting information: {str(e)}"}
@@ -445,18 +685,58 @@ class MusicDownloader:
             logger.error(f"Error getting information: {e}")
             return {"error": str(e)}
     
+    async def get_audio_info_async(self, url: str, basic_only: bool = False) -> Dict[str, Any]:
+        """
+        Async variant of get_audio_info.
+        
+        With basic_only, YouTube lookups use the oEmbed endpoint (title,
+        uploader and thumbnail only) instead of a full yt-dlp extraction,
+        falling back to yt-dlp if oEmbed fails.
+        """
+        async with self._info_semaphore:
+            if basic_only:
+                is_valid, platform_type = URLValidator.is_valid_url(url)
+                if is_valid and platform_type in ("youtube", "youtube_music"):
+                    data = await asyncio.to_thread(fetch_oembed, YOUTUBE_OEMBED_URL, url)
+                    if data:
+                        return {
+                            "success": True,
+                            "title": data.get('title', 'Unknown'),
+                            "artist": data.get('author_name', 'Unknown'),
+                            "platform": platform_type,
+                            "thumbnail_url": data.get('thumbnail_url', '')
+                        }
+            
+            return await asyncio.to_thread(self.get_audio_info, url)
+    
     def get_available_qualities(self) -> list:
         """Get list of available qualities."""
         return QualityManager.get_available_qualities()
     
     def health_check(self) -> Dict[str, Any]:
-        """Check service status."""
-        services = {
-            "spotify": self._test_spotdl_connection(),
-            "youtube": self._test_youtube_connection(),
-            "output_directory": os.path.exists(self.output_dir) and os.access(self.output_dir, os.W_OK)
+        """Check service status, running the probes concurrently."""
+        probes = {
+            "spotify": self._test_spotdl_connection,
+            "youtube": self._test_youtube_connection,
+            "output_directory": self._test_output_directory
         }
         
+        executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="health-probe")
+        try:
+            futures = {name: executor.submit(probe) for name, probe in probes.items()}
+            deadline = time.monotonic() + self.HEALTH_PROBE_TIMEOUT
+            services = {}
+            for name, future in futures.items():
+                try:
+                    services[name] = bool(future.result(timeout=max(deadline - time.monotonic(), 0)))
+                except Exception as e:
+                    # Timed out or failed: report the service as unavailable
+                    logger.warning(f"Health probe '{name}' failed: {e!r}")
+                    services[name] = False
+        finally:
+            # Do not wait for probes that missed the deadline
+            executor.shutdown(wait=False)
+        
         all_healthy = all(services.values())
         
         return {
@@ -465,20 +745,13 @@ class MusicDownloader:
             "message": "All services working" if all_healthy else "Some services unavailable"
         }
     
+    def _test_output_directory(self) -> bool:
+        """Test that the output directory exists and is writable."""
+        return os.path.exists(self.output_dir) and os.access(self.output_dir, os.W_OK)
+    
     def _test_spotdl_connection(self) -> bool:
-        """Test if spotdl is available."""
-        try:
-            import subprocess
-            # Check if we're in a uv environment
-            if os.environ.get('VIRTUAL_ENV') or os.environ.get('UV_PROJECT_ENVIRONMENT'):
-                cmd = ['uv', 'run', 'spotdl', '--version']
-            else:
-                cmd = ['spotdl', '--version']
-                
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except Exception:
-            return False
+        """Test if spotdl is available (cached, see get_spotdl_version)."""
+        return get_spotdl_version() is not None
     
     def _test_youtube_connection(self) -> bool:
         """Test YouTube connection with a lightweight check."""
@@ -499,14 +772,34 @@ class MusicDownloader:
         except Exception as e:
             logger.error(f"Error limpiando archivos temporales: {e}")
 
+@functools.cache
+def get_downloader() -> MusicDownloader:
+    """
+    Get the shared MusicDownloader, created on first use.
+    
+    Creating it sets up the output directory and checks spotdl, so it is
+    deferred until a download actually needs it rather than done at import.
+    """
+    return MusicDownloader()
+
 class DownloadService:
     """
     Service layer for music download operations.
     Provides a clean interface for download functionality.
     """
     
-    def __init__(self):
-        self._downloader = MusicDownloader()
+    # Seconds a health check result is reused
+    HEALTH_CHECK_TTL = 5
+    
+    def __init__(self, downloader: Optional[MusicDownloader] = None):
+        # Without an explicit downloader, the shared one is used (see get_downloader)
+        self._explicit_downloader = downloader
+        self._health_cache: Optional[Dict[str, Any]] = None
+        self._health_expires = 0.0
+    
+    @property
+    def _downloader(self) -> MusicDownloader:
+        return self._explicit_downloader or get_downloader()
     
     def download_audio(self, url: str, quality: str = "192", progress_tracker=None):
         """Download audio from supported platforms."""
@@ -517,13 +810,21 @@ class DownloadService:
         """Get audio information without downloading."""
         return self._downloader.get_audio_info(url)
     
+    async def get_audio_info_async(self, url: str, basic_only: bool = False):
+        """Get audio information without blocking the event loop."""
+        return await self._downloader.get_audio_info_async(url, basic_only)
+    
     def health_check(self):
-        """Check service health."""
-        return self._downloader.health_check()
+        """Check service health (cached for HEALTH_CHECK_TTL seconds)."""
+        now = time.monotonic()
+        if self._health_cache is None or now >= self._health_expires:
+            self._health_cache = self._downloader.health_check()
+            self._health_expires = now + self.HEALTH_CHECK_TTL
+        return self._health_cache
     
     def cleanup(self):
         """Cleanup temporary files."""
         return self._downloader.cleanup()
 
-# Legacy global instance for backward compatibility
-downloader = MusicDownloader()
\ No newline at end of file
+# Shared service instance, wrapping the shared downloader
+download_service = DownloadService()
\ No newline at end of file
@@ -5,28 +5,95 @@ Handles downloading multiple files with individual progress tracking and error h
 """
 
 import os
+import re
+import math
 import tempfile
 import shutil
 import subprocess
 import logging
 import json
+import hashlib
+import zipfile
+import queue
+import threading
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 from enum import Enum
-
-import yt_dlp
+from dataclasses import dataclass
 
 from ..core.utils import URLValidator, FileUtils, QualityManager, ErrorHandler
 from ..core.config import settings
-from .download_service import AudioQuality, Platform, DownloadResult, MusicDownloader
+from .download_service import AudioQuality, Platform, DownloadResult, MusicDownloader, get_downloader, search_spotify_tracks
 
 logger = logging.getLogger(__name__)
 
+# spotdl output line reporting a finished track
+_SPOTDL_STATUS_RE = re.compile(r'\b(Downloaded|Skipping)\b')
+
+def _drain_lines(stream, lines: "queue.Queue[Optional[str]]") -> None:
+    """Read a process stream into a queue, ending with None at EOF."""
+    try:
+        for line in stream:
+            lines.put(line)
+    finally:
+        lines.put(None)
+
+class _DiskCache:
+    """JSON files keyed by URL hash that expire by modification time."""
+    
+    def __init__(self, directory: Path):
+        self.directory = directory
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+    
+    def get(self, key: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """Return the stored value, or None if missing, expired or unreadable."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime >= ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write aside and swap in, so readers never see a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write playlist cache file {path}: {e}")
+    
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+    
+    def clear(self) -> None:
+        if self.directory.is_dir():
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+@dataclass(slots=True)
+class DownloadedFile:
+    """A file produced by a multi-file download."""
+    name: str
+    path: str
+    size: int
+    metadata: Dict[str, Any]
+
 class MultiDownloadResult:
     """Result of a multi-file download operation."""
     
     def __init__(self, success: bool, total_files: int = 0, completed_files: int = 0, 
-                 failed_files: int = 0, files: List[Dict[str, Any]] = None, 
+                 failed_files: int = 0, files: List[DownloadedFile] = None, 
                  error: str = None, download_folder: str = None):
         self.success = success
         self.total_files = total_files
@@ -39,11 +106,57 @@ class MultiDownloadResult:
 class MultiMusicDownloader:
     """Downloads music from multiple platforms with multi-file support."""
     
+    # Seconds a playlist info result is reused
+    INFO_CACHE_TTL = 600
+    
+    # Seconds playlist info stays in the disk cache; album contents don't
+    # change, playlists may
+    DISK_CACHE_TTL = {"album": 86400}
+    DISK_CACHE_DEFAULT_TTL = 3600
+    
+    # Most seconds spent extracting YouTube playlist info
+    INFO_TIMEOUT = 300
+    
+    # Minimum seconds between in-progress file updates sent to the tracker
+    PROGRESS_UPDATE_INTERVAL = 0.25
+    
+    # yt-dlp record of the videos already downloaded into a playlist folder
+    DOWNLOAD_ARCHIVE_NAME = ".archive.txt"
+    
+    # Audio files collected from a playlist folder
+    AUDIO_EXTENSIONS = ('.mp3', '.m4a')
+    
+    # Most concurrent yt-dlp workers for one YouTube playlist
+    MAX_PLAYLIST_SHARDS = 5
+    
+    # Caps concurrent per-track spotdl runs across all playlist downloads
+    _spotdl_slots = threading.BoundedSemaphore(settings.max_concurrent_downloads)
+    
+    # Runs YouTube playlist info extractions; bounded, so extractions hung past
+    # INFO_TIMEOUT can tie up at most this many threads
+    _info_executor = ThreadPoolExecutor(
+        max_workers=settings.max_concurrent_downloads,
+        thread_name_prefix="playlist-info"
+    )
+    
     def __init__(self, output_dir: str = "./downloads", max_files_per_download: int = 50):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.max_files_per_download = max_files_per_download
         
+        # Playlist info by URL: (monotonic timestamp, info)
+        self._info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._info_cache_lock = threading.Lock()
+        self._disk_cache = _DiskCache(Path(settings.cache_dir) / "playlists")
+        
+        # Per-thread flat-extraction YoutubeDL (see _get_flat_ydl)
+        self._ydl_local = threading.local()
+        
+    @property
+    def single_downloader(self) -> MusicDownloader:
+        """Shared single-track downloader, whose output directory holds playlist folders."""
+        return get_downloader()
+    
     def _get_spotdl_command(self):
         """Get the appropriate spotdl command based on environment."""
         # Check if we're in a uv environment
@@ -64,8 +177,55 @@ class MultiMusicDownloader:
             # Try regular spotdl first
             return ['spotdl']
         
-    def get_playlist_info(self, url: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get information about a playlist/album without downloading."""
+    def get_playlist_info(self, url: str, refresh: bool = False) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Get information about a playlist/album without downloading.
+        
+        Results are cached in memory for INFO_CACHE_TTL seconds and on disk
+        (surviving restarts) for DISK_CACHE_TTL; pass refresh=True to fetch
+        them again.
+        """
+        if not refresh:
+            with self._info_cache_lock:
+                cached = self._info_cache.get(url)
+            if cached and time.monotonic() - cached[0] < self.INFO_CACHE_TTL:
+                return True, cached[1]
+            
+            ttl = self.DISK_CACHE_TTL.get(self._content_type(url), self.DISK_CACHE_DEFAULT_TTL)
+            info = self._disk_cache.get(url, ttl)
+            if info is not None:
+                with self._info_cache_lock:
+                    self._info_cache[url] = (time.monotonic(), info)
+                return True, info
+        
+        success, info = self._fetch_playlist_info(url)
+        
+        # Estimated (fallback) info is not cached, so the next call retries
+        if success and not info.get("estimated"):
+            with self._info_cache_lock:
+                self._info_cache[url] = (time.monotonic(), info)
+            self._disk_cache.set(url, info)
+        return success, info
+    
+    @staticmethod
+    def _content_type(url: str) -> str:
+        """Guess the content type of a URL without fetching it."""
+        return "album" if "/album/" in url else "playlist" if "/playlist/" in url or "list=" in url else "track"
+    
+    def invalidate(self, url: str) -> None:
+        """Drop the cached information of a playlist/album."""
+        with self._info_cache_lock:
+            self._info_cache.pop(url, None)
+        self._disk_cache.delete(url)
+    
+    def clear_cache(self) -> None:
+        """Drop the cached information of every playlist/album."""
+        with self._info_cache_lock:
+            self._info_cache.clear()
+        self._disk_cache.clear()
+    
+    def _fetch_playlist_info(self, url: str) -> Tuple[bool, Dict[str, Any]]:
+        """Fetch information about a playlist/album from its platform."""
         try:
             # Validate URL first
             is_valid, platform = URLValidator.is_valid_url(url)
@@ -87,41 +247,55 @@ class MultiMusicDownloader:
             logger.error(f"Error getting playlist info: {e}")
             return False, {"error": str(e)}
     
-    def _get_spotify_playlist_info(self, url: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get Spotify playlist/album information."""
-        try:
-            # Use spotdl save to get playlist info (save doesn't download, just lists)
-            temp_file = f"/tmp/spotify_info_{os.getpid()}.spotdl"
+    def _save_spotify_tracks(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """Resolve the tracks of a Spotify URL by running `spotdl save`; None on failure."""
+        # Use spotdl save to get playlist info (save doesn't download, just lists).
+        # The save file is unique per call and removed when the block exits.
+        with tempfile.NamedTemporaryFile(suffix=".spotdl", delete_on_close=False) as save_file:
+            save_file.close()  # spotdl writes it by name
             
             cmd = self._get_spotdl_command() + [
                 "save", url, 
-                "--save-file", temp_file,
+                "--save-file", save_file.name,
                 "--output", "{artist} - {name}"
             ]
             
             logger.info(f"Executing spotdl command: {' '.join(cmd)}")
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
             
-            if result.returncode == 0 and os.path.exists(temp_file):
+            if result.returncode == 0 and os.path.getsize(save_file.name):
                 # Read the saved file to get track list (it's JSON format)
+                with open(save_file.name, 'r', encoding='utf-8') as f:
+                    return json.loads(f.read())
+        
+        error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+        stdout_msg = result.stdout.strip() if result.stdout else "No output"
+        logger.error(f"Spotdl command failed: {error_msg}")
+        logger.error(f"Spotdl command: {' '.join(cmd)}")
+        logger.error(f"Spotdl stdout: {stdout_msg}")
+        logger.error(f"Spotdl return code: {result.returncode}")
+        return None
+    
+    def _get_spotify_playlist_info(self, url: str) -> Tuple[bool, Dict[str, Any]]:
+        """Get Spotify playlist/album information."""
+        try:
+            tracks_data = search_spotify_tracks(url)
+            if tracks_data is None:
+                tracks_data = self._save_spotify_tracks(url)
+            
+            if tracks_data is not None:
                 try:
-                    with open(temp_file, 'r', encoding='utf-8') as f:
-                        tracks_data = json.load(f)
-                    
-                    # Extract track names from JSON
+                    # Extract track names (and their Spotify URLs) from JSON
                     tracks = []
+                    track_urls = []
                     for track in tracks_data:
                         if isinstance(track, dict) and 'name' in track and 'artists' in track:
                             artists = ', '.join([artist if isinstance(artist, str) else artist.get('name', 'Unknown') 
                                                for artist in track['artists']])
                             track_name = f"{artists} - {track['name']}"
                             tracks.append(track_name)
-                
-                    # Clean up temp file
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
+                            if track.get('url'):
+                                track_urls.append(track['url'])
                 
                     # Determine if it's an album or playlist
                     content_type = "album" if "/album/" in url else "playlist" if "/playlist/" in url else "track"
@@ -149,18 +323,13 @@ class MultiMusicDownloader:
                     "platform": "spotify",
                     "total_tracks": len(tracks),
                     "tracks": tracks[:self.max_files_per_download],  # Apply limit
+                    # Only usable when every track has its URL, to keep indexes aligned
+                    "track_urls": track_urls[:self.max_files_per_download] if len(track_urls) == len(tracks) else [],
                     "url": url,
                     "title": title,
                     "limited": len(tracks) > self.max_files_per_download
                 }
             else:
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                stdout_msg = result.stdout.strip() if result.stdout else "No output"
-                logger.error(f"Spotdl command failed: {error_msg}")
-                logger.error(f"Spotdl command: {' '.join(cmd)}")
-                logger.error(f"Spotdl stdout: {stdout_msg}")
-                logger.error(f"Spotdl return code: {result.returncode}")
-                
                 # Fallback: try to determine basic info from URL
                 content_type = "album" if "/album/" in url else "playlist" if "/playlist/" in url else "track"
                 
@@ -171,11 +340,15 @@ class MultiMusicDownloader:
                     "tracks": [f"Track from Spotify {content_type}"],
                     "url": url,
                     "title": f"Spotify {content_type.title()}",
-                    "limited": False
+                    "limited": False,
+                    "estimated": True
                 }
                 
         except subprocess.TimeoutExpired:
             return False, {"error": "Timeout getting Spotify playlist info"}
+        except ValueError as e:
+            logger.error(f"Error parsing JSON file: {e}")
+            return False, {"error": f"Error parsing playlist data: {str(e)}"}
         except Exception as e:
             logger.error(f"Error getting Spotify playlist info: {e}")
             # Fallback for any error
@@ -187,74 +360,113 @@ class MultiMusicDownloader:
                 "tracks": [f"Spotify {content_type} content"],
                 "url": url,
                 "title": f"Spotify {content_type.title()}",
-                "limited": False
+                "limited": False,
+                "estimated": True
             }
     
     def _get_youtube_playlist_info(self, url: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get YouTube playlist information."""
+        """Get YouTube playlist information, giving up after INFO_TIMEOUT seconds."""
+        # Entries are fetched lazily, so the whole extraction runs in the worker
+        future = self._info_executor.submit(self._extract_youtube_playlist_info, url)
         try:
-            ydl_opts = {
+            return future.result(timeout=self.INFO_TIMEOUT)
+        except TimeoutError:
+            # Drop it if it never started; a hung extraction is left to finish on its own
+            future.cancel()
+            logger.error(f"Timed out getting YouTube playlist info after {self.INFO_TIMEOUT}s: {url}")
+            return False, {"error": "Playlist info timeout"}
+    
+    def _get_flat_ydl(self):
+        """
+        Get this thread's YoutubeDL for playlist info, creating it on first use.
+        
+        YoutubeDL is not thread-safe, hence one per thread.
+        """
+        ydl = getattr(self._ydl_local, 'flat_ydl', None)
+        if ydl is None:
+            import yt_dlp
+            
+            ydl = yt_dlp.YoutubeDL({
                 'quiet': True,
                 'no_warnings': True,
-                'extract_flat': True,  # Only get playlist info, don't download
-                'playlistend': self.max_files_per_download  # Limit playlist size
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+                'extract_flat': 'in_playlist',  # Only get playlist info, don't download
+                'lazy_playlist': True,  # Fetch playlist pages only as entries are needed
+                'playlistend': self.max_files_per_download,  # Limit playlist size
+                # Don't let one slow or broken entry stall the whole playlist
+                'socket_timeout': 15,
+                'ignoreerrors': True,
+                'retries': 2,
+                'extractor_retries': 2
+            })
+            self._ydl_local.flat_ydl = ydl
+        return ydl
+    
+    def _extract_youtube_playlist_info(self, url: str) -> Tuple[bool, Dict[str, Any]]:
+        """Extract YouTube playlist information with yt-dlp."""
+        try:
+            ydl = self._get_flat_ydl()
+            info = ydl.extract_info(url, download=False)
+            
+            if not info:
+                # With ignoreerrors yt-dlp reports a failed extraction as None
+                return False, {"error": "Could not get YouTube playlist info"}
+            
+            if 'entries' in info:
+                # It's a playlist; stop reading entries at the download limit
+                tracks = [
+                    f"{entry.get('uploader', 'Unknown Artist')} - {entry.get('title', 'Unknown Title')}"
+                    for entry in islice(info['entries'] or (), self.max_files_per_download)
+                    if entry
+                ]
+                
+                return True, {
+                    "type": "playlist",
+                    "platform": "youtube_music" if "music.youtube.com" in url else "youtube",
+                    "total_tracks": len(tracks),
+                    "tracks": tracks,
+                    "url": url,
+                    "title": info.get('title', 'YouTube Playlist'),
+                    "uploader": info.get('uploader', 'Unknown'),
+                    "limited": len(tracks) >= self.max_files_per_download
+                }
+            else:
+                # Single video, treat as single track
+                title = info.get('title', 'Unknown Title')
+                uploader = info.get('uploader', 'Unknown Artist')
+                
+                return True, {
+                    "type": "track",
+                    "platform": "youtube_music" if "music.youtube.com" in url else "youtube",
+                    "total_tracks": 1,
+                    "tracks": [f"{uploader} - {title}"],
+                    "url": url,
+                    "title": title,
+                    "uploader": uploader,
+                    "limited": False
+                }
                 
-                if 'entries' in info:
-                    # It's a playlist
-                    entries = list(info['entries'])
-                    tracks = []
-                    
-                    for entry in entries:
-                        if entry:
-                            title = entry.get('title', 'Unknown Title')
-                            uploader = entry.get('uploader', 'Unknown Artist')
-                            tracks.append(f"{uploader} - {title}")
-                    
-                    return True, {
-                        "type": "playlist",
-                        "platform": "youtube_music" if "music.youtube.com" in url else "youtube",
-                        "total_tracks": len(tracks),
-                        "tracks": tracks,
-                        "url": url,
-                        "title": info.get('title', 'YouTube Playlist'),
-                        "uploader": info.get('uploader', 'Unknown'),
-                        "limited": len(entries) >= self.max_files_per_download
-                    }
-                else:
-                    # Single video, treat as single track
-                    title = info.get('title', 'Unknown Title')
-                    uploader = info.get('uploader', 'Unknown Artist')
-                    
-                    return True, {
-                        "type": "track",
-                        "platform": "youtube_music" if "music.youtube.com" in url else "youtube",
-                        "total_tracks": 1,
-                        "tracks": [f"{uploader} - {title}"],
-                        "url": url,
-                        "title": title,
-                        "uploader": uploader,
-                        "limited": False
-                    }
-                    
         except Exception as e:
             logger.error(f"Error getting YouTube playlist info: {e}")
             return False, {"error": str(e)}
     
     def download_multiple(self, url: str, quality: AudioQuality = AudioQuality.HIGH, 
-                         progress_tracker=None) -> MultiDownloadResult:
-        """Download multiple files from a playlist/album."""
+                         progress_tracker=None, info: Optional[Dict[str, Any]] = None) -> MultiDownloadResult:
+        """
+        Download multiple files from a playlist/album.
+        
+        Pass the info from get_playlist_info when the caller already has it;
+        its tracks (and Spotify track URLs) are then used without resolving
+        the playlist again.
+        """
         try:
             # Get playlist information first
-            success, info = self.get_playlist_info(url)
-            if not success:
-                return MultiDownloadResult(
-                    success=False,
-                    error=info.get("error", "Could not get playlist information")
-                )
+            if info is None:
+                success, info = self.get_playlist_info(url)
+                if not success:
+                    return MultiDownloadResult(
+                        success=False,
+                        error=info.get("error", "Could not get playlist information")
+                    )
             
             total_files = info["total_tracks"]
             content_type = info["type"]
@@ -284,12 +496,12 @@ class MultiMusicDownloader:
                         total_files=1,
                         completed_files=1,
                         failed_files=0,
-                        files=[{
-                            "name": os.path.basename(result.file_path),
-                            "path": result.file_path,
-                            "size": result.file_size,
-                            "metadata": result.metadata
-                        }]
+                        files=[DownloadedFile(
+                            name=os.path.basename(result.file_path),
+                            path=result.file_path,
+                            size=result.file_size,
+                            metadata=result.metadata
+                        )]
                     )
                 else:
                     progress_tracker.complete_file(0, info["tracks"][0], False, result.error)
@@ -347,72 +559,83 @@ class MultiMusicDownloader:
             total_files = info["total_tracks"]
             completed_files = 0
             failed_files = 0
-            files = []
             
             if progress_tracker:
                 progress_tracker.update_overall("downloading", f"Descargando {total_files} archivos de Spotify")
             
-            # Use spotdl to download entire playlist/album
-            download_cmd = self._get_spotdl_command() + [
-                "download", url,
-                "--output", download_folder,
-                "--format", "mp3",
-                "--bitrate", f"{quality.value}k",
-                "--overwrite", "force"
-            ]
-            
-            logger.info(f"Executing spotdl command: {' '.join(download_cmd)}")
-            
-            # Execute download with real-time progress
-            process = subprocess.Popen(
-                download_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                universal_newlines=True
-            )
-            
-            current_file_index = 0
-            
-            for line in process.stdout:
-                line = line.strip()
-                if line:
-                    logger.info(f"Spotdl output: {line}")
-                    
-                    # Parse spotdl output for progress
-                    if "Downloaded" in line or "Skipping" in line:
-                        if progress_tracker and current_file_index < total_files:
-                            track_name = info["tracks"][current_file_index] if current_file_index < len(info["tracks"]) else f"Track {current_file_index + 1}"
-                            progress_tracker.complete_file(current_file_index, track_name, "Downloaded" in line)
-                            
-                            if "Downloaded" in line:
-                                completed_files += 1
-                            else:
-                                failed_files += 1
-                            
-                            current_file_index += 1
-                    
-                    elif progress_tracker and current_file_index < total_files:
-                        # Update current file progress
-                        track_name = info["tracks"][current_file_index] if current_file_index < len(info["tracks"]) else f"Track {current_file_index + 1}"
-                        progress_tracker.update_current_file(current_file_index, track_name, 50, "downloading", line)
-            
-            process.wait()
+            track_urls = info.get("track_urls") or []
+            if len(track_urls) > 1:
+                # One spotdl run per track, several at a time
+                completed_files, failed_files = self._download_spotify_tracks(
+                    track_urls, quality, download_folder, info, progress_tracker
+                )
+            else:
+                # Use spotdl to download entire playlist/album
+                download_cmd = self._get_spotdl_command() + [
+                    "download", url,
+                    "--output", download_folder,
+                    "--format", "mp3",
+                    "--bitrate", f"{quality.value}k",
+                    "--overwrite", "skip"  # Keep tracks from a previous run
+                ]
+                
+                logger.info(f"Executing spotdl command: {' '.join(download_cmd)}")
+                
+                # Execute download with real-time progress
+                process = subprocess.Popen(
+                    download_cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    universal_newlines=True
+                )
+                
+                # spotdl's output is read by its own thread, so parsing and progress
+                # updates never hold up spotdl's writes to the pipe
+                lines: "queue.Queue[Optional[str]]" = queue.Queue()
+                threading.Thread(
+                    target=_drain_lines, args=(process.stdout, lines),
+                    name="spotdl-stdout", daemon=True
+                ).start()
+                
+                current_file_index = 0
+                last_update = 0.0
+                track_names = self._track_names(info, total_files)
+                
+                for line in iter(lines.get, None):
+                    line = line.strip()
+                    if line:
+                        logger.info("Spotdl output: %s", line)
+                
+                        # Parse spotdl output for progress
+                        status_match = _SPOTDL_STATUS_RE.search(line)
+                        if status_match:
+                            if progress_tracker and current_file_index < total_files:
+                                # Tracks kept from a previous run count as downloaded
+                                downloaded = status_match.group(1) == "Downloaded" or "already exists" in line
+                                track_name = track_names[current_file_index]
+                                progress_tracker.complete_file(current_file_index, track_name, downloaded)
+                
+                                if downloaded:
+                                    completed_files += 1
+                                else:
+                                    failed_files += 1
+                
+                                current_file_index += 1
+                
+                        elif (progress_tracker and current_file_index < total_files
+                              and time.monotonic() - last_update >= self.PROGRESS_UPDATE_INTERVAL):
+                            # Update current file progress (spotdl prints many lines per track)
+                            last_update = time.monotonic()
+                            track_name = track_names[current_file_index]
+                            progress_tracker.update_current_file(current_file_index, track_name, 50, "downloading", line)
+                
+                process.wait()
             
             # Collect downloaded files
-            if os.path.exists(download_folder):
-                for file in os.listdir(download_folder):
-                    if file.endswith(('.mp3', '.m4a')):
-                        file_path = os.path.join(download_folder, file)
-                        # Clean extension if needed
-                        clean_path = FileUtils.clean_file_extension(file_path)
-                        
-                        files.append({
-                            "name": os.path.basename(clean_path),
-                            "path": clean_path,
-                            "size": FileUtils.get_file_size(clean_path),
-                            "metadata": {"platform": "spotify", "quality": quality.value}
-                        })
+            files = self._collect_downloaded_files(
+                download_folder, {"platform": "spotify", "quality": quality.value}
+            )
             
             success = completed_files > 0
             
@@ -442,6 +665,86 @@ class MultiMusicDownloader:
                 error=str(e)
             )
     
+    def _track_names(self, info: Dict[str, Any], total_files: int) -> List[str]:
+        """Display name of every track index, "Track N" where the info has none."""
+        tracks = info["tracks"]
+        return tracks + [f"Track {i + 1}" for i in range(len(tracks), total_files)]
+    
+    def _collect_downloaded_files(self, download_folder: str, metadata: Dict[str, Any]) -> List[DownloadedFile]:
+        """List the audio files of a download folder in one scandir pass."""
+        files = []
+        add = files.append
+        extensions = self.AUDIO_EXTENSIONS
+        try:
+            with os.scandir(download_folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(extensions) and entry.is_file():
+                        add(DownloadedFile(
+                            name=entry.name,
+                            path=entry.path,
+                            size=entry.stat().st_size,
+                            metadata=dict(metadata)
+                        ))
+        except FileNotFoundError:
+            pass
+        return files
+    
+    def _spotdl_one(self, track_url: str, quality: AudioQuality, download_folder: str) -> Tuple[bool, Optional[str]]:
+        """Download a single Spotify track with spotdl. Returns (success, error)."""
+        cmd = self._get_spotdl_command() + [
+            "download", track_url,
+            "--output", download_folder,
+            "--format", "mp3",
+            "--bitrate", f"{quality.value}k",
+            "--overwrite", "skip"  # Keep tracks from a previous run
+        ]
+        
+        with self._spotdl_slots:
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            except subprocess.TimeoutExpired:
+                return False, "Timeout downloading track"
+        
+        if result.returncode != 0:
+            return False, (result.stderr or result.stdout).strip()[-200:] or f"spotdl exited with code {result.returncode}"
+        return True, None
+    
+    def _download_spotify_tracks(self, track_urls: List[str], quality: AudioQuality,
+                                 download_folder: str, info: Dict[str, Any],
+                                 progress_tracker=None) -> Tuple[int, int]:
+        """
+        Download Spotify tracks concurrently, one spotdl process per track.
+        
+        Returns:
+            (completed_files, failed_files)
+        """
+        tracks = info["tracks"]
+        completed_files = 0
+        failed_files = 0
+        
+        with ThreadPoolExecutor(max_workers=settings.max_concurrent_downloads) as executor:
+            futures = {
+                executor.submit(self._spotdl_one, track_url, quality, download_folder): index
+                for index, track_url in enumerate(track_urls)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    success, error = future.result()
+                except Exception as e:
+                    success, error = False, str(e)
+                
+                if success:
+                    completed_files += 1
+                else:
+                    failed_files += 1
+                    logger.warning(f"Spotdl failed for {track_urls[index]}: {error}")
+                
+                if progress_tracker:
+                    progress_tracker.complete_file(index, tracks[index], success, error)
+        
+        return completed_files, failed_files
+    
     def _download_youtube_multiple(self, url: str, quality: AudioQuality, 
                                  download_folder: str, info: Dict[str, Any], 
                                  progress_tracker=None) -> MultiDownloadResult:
@@ -450,34 +753,46 @@ class MultiMusicDownloader:
             total_files = info["total_tracks"]
             completed_files = 0
             failed_files = 0
-            files = []
             
             if progress_tracker:
                 progress_tracker.update_overall("downloading", f"Descargando {total_files} archivos de YouTube")
             
-            # Configure yt-dlp for playlist download
+            # Configure yt-dlp for playlist download. playlist_index is the
+            # position in the whole playlist, so it holds across shards.
+            # yt-dlp calls the hook per downloaded chunk, so in-progress
+            # updates are limited to one per PROGRESS_UPDATE_INTERVAL
+            last_update = 0.0
+            track_names = self._track_names(info, total_files)
+            
             def progress_hook(d):
-                if progress_tracker and d['status'] == 'downloading':
+                nonlocal last_update
+                playlist_index = d.get('info_dict', {}).get('playlist_index')
+                if progress_tracker and playlist_index and d['status'] == 'downloading':
+                    now = time.monotonic()
+                    if now - last_update < self.PROGRESS_UPDATE_INTERVAL:
+                        return
+                    last_update = now
+                    
                     # Extract current file info
-                    filename = d.get('filename', 'Unknown')
-                    if 'playlist_index' in d:
-                        file_index = d['playlist_index'] - 1
-                        if file_index < len(info["tracks"]):
-                            track_name = info["tracks"][file_index]
-                        else:
-                            track_name = f"Track {file_index + 1}"
-                        
-                        if 'total_bytes' in d and d['total_bytes']:
-                            downloaded = d.get('downloaded_bytes', 0)
-                            total = d['total_bytes']
-                            percentage = int((downloaded / total) * 100)
-                            progress_tracker.update_current_file(file_index, track_name, percentage, "downloading")
+                    file_index = playlist_index - 1
+                    track_name = track_names[file_index]
+                    
+                    if 'total_bytes' in d and d['total_bytes']:
+                        downloaded = d.get('downloaded_bytes', 0)
+                        total = d['total_bytes']
+                        percentage = int((downloaded / total) * 100)
+                        progress_tracker.update_current_file(file_index, track_name, percentage, "downloading")
                 
-                elif progress_tracker and d['status'] == 'finished':
-                    if 'playlist_index' in d:
-                        file_index = d['playlist_index'] - 1
-                        track_name = info["tracks"][file_index] if file_index < len(info["tracks"]) else f"Track {file_index + 1}"
-                        progress_tracker.complete_file(file_index, track_name, True)
+                elif progress_tracker and playlist_index and d['status'] == 'finished':
+                    file_index = playlist_index - 1
+                    track_name = track_names[file_index]
+                    progress_tracker.complete_file(file_index, track_name, True)
+            
+            # The archive only describes files that are still there; once they
+            # have been cleaned up (e.g. after zipping), start over
+            archive_path = os.path.join(download_folder, self.DOWNLOAD_ARCHIVE_NAME)
+            if not self._collect_downloaded_files(download_folder, {}):
+                Path(archive_path).unlink(missing_ok=True)
             
             ydl_opts = {
                 'format': 'bestaudio/best',
@@ -490,27 +805,40 @@ class MultiMusicDownloader:
                 'progress_hooks': [progress_hook],
                 'quiet': False,
                 'no_warnings': False,
-                'playlistend': self.max_files_per_download
+                'playlistend': self.max_files_per_download,
+                # Videos downloaded by a previous run are skipped
+                'download_archive': archive_path
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            import yt_dlp
+            
+            # Split the playlist into contiguous ranges, one yt-dlp worker each
+            track_count = min(total_files, self.max_files_per_download)
+            workers = max(1, min(settings.max_concurrent_downloads, self.MAX_PLAYLIST_SHARDS, track_count))
+            chunk_size = math.ceil(track_count / workers)
+            shards = [(start, min(start + chunk_size - 1, track_count))
+                      for start in range(1, track_count + 1, chunk_size)]
+            
+            def download_shard(start: int, end: int) -> None:
+                logger.info(f"Downloading playlist items {start}-{end} of {track_count}")
+                with yt_dlp.YoutubeDL({**ydl_opts, 'playliststart': start, 'playlistend': end}) as ydl:
+                    ydl.download([url])
+            
+            # Files are collected from the folder afterwards, so shards share no state
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                futures = {executor.submit(download_shard, start, end): (start, end) for start, end in shards}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        start, end = futures[future]
+                        logger.error(f"Error downloading playlist items {start}-{end}: {e}")
             
             # Collect downloaded files
-            if os.path.exists(download_folder):
-                for file in os.listdir(download_folder):
-                    if file.endswith(('.mp3', '.m4a')):
-                        file_path = os.path.join(download_folder, file)
-                        # Clean extension if needed
-                        clean_path = FileUtils.clean_file_extension(file_path)
-                        
-                        files.append({
-                            "name": os.path.basename(clean_path),
-                            "path": clean_path,
-                            "size": FileUtils.get_file_size(clean_path),
-                            "metadata": {"platform": info["platform"], "quality": quality.value}
-                        })
-                        completed_files += 1
+            files = self._collect_downloaded_files(
+                download_folder, {"platform": info["platform"], "quality": quality.value}
+            )
+            completed_files = len(files)
             
             failed_files = total_files - completed_files
             success = completed_files > 0
@@ -541,12 +869,12 @@ class MultiMusicDownloader:
                 error=str(e)
             )
     
-    def create_playlist_zip(self, files: List[Dict[str, Any]], playlist_name: str) -> Optional[str]:
+    def create_playlist_zip(self, files: List[DownloadedFile], playlist_name: str) -> Optional[str]:
         """
         Create a ZIP file from downloaded playlist files.
         
         Args:
-            files: List of file dictionaries with 'path' and 'name' keys
+            files: Downloaded files
             playlist_name: Name for the ZIP file
             
         Returns:
@@ -558,15 +886,16 @@ class MultiMusicDownloader:
                 return None
             
             # Get file paths
-            file_paths = [file_info["path"] for file_info in files if os.path.exists(file_info["path"])]
+            file_paths = [file_info.path for file_info in files if os.path.exists(file_info.path)]
             
             if not file_paths:
                 logger.warning("No valid file paths found for ZIP creation")
                 return None
             
-            # Create ZIP in the same directory as the first file
+            # Create ZIP in the same directory as the first file. Playlist files
+            # are all compressed audio, so they are stored without DEFLATE
             output_dir = os.path.dirname(file_paths[0])
-            zip_path = FileUtils.create_zip_archive(file_paths, playlist_name, output_dir)
+            zip_path = FileUtils.create_zip_archive(file_paths, playlist_name, output_dir, zipfile.ZIP_STORED)
             
             if zip_path:
                 logger.info(f"Created playlist ZIP: {zip_path}")
@@ -579,42 +908,47 @@ class MultiMusicDownloader:
             logger.error(f"Error creating playlist ZIP: {e}")
             return None
     
-    def cleanup_after_zip(self, files: List[Dict[str, Any]], keep_zip: bool = True) -> int:
+    def cleanup_after_zip(self, files: List[DownloadedFile], keep_zip: bool = True) -> int:
         """
         Clean up individual files after ZIP creation.
         
         Args:
-            files: List of file dictionaries
+            files: Downloaded files
             keep_zip: Whether to keep ZIP files
             
         Returns:
             Number of files cleaned up
         """
         try:
-            file_paths = [file_info["path"] for file_info in files if os.path.exists(file_info["path"])]
+            # Missing files are skipped by the cleanup itself
+            file_paths = [file_info.path for file_info in files]
             return FileUtils.cleanup_files(file_paths, keep_zip)
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
             return 0
     
-    def move_files_to_external(self, files: List[Dict[str, Any]], external_dir: str) -> List[str]:
+    def move_files_to_external(self, files: List[DownloadedFile], external_dir: str) -> List[str]:
         """
         Move downloaded files to external directory.
         
         Args:
-            files: List of file dictionaries
+            files: Downloaded files
             external_dir: External directory path
             
         Returns:
             List of new file paths
         """
         try:
-            file_paths = [file_info["path"] for file_info in files if os.path.exists(file_info["path"])]
+            # Missing files are skipped by the move itself, no need to stat them first
+            file_paths = [file_info.path for file_info in files]
             return FileUtils.move_files_to_external_dir(file_paths, external_dir)
         except Exception as e:
             logger.error(f"Error moving files to external directory: {e}")
             return []
 
+# Shared instance; PlaylistService delegates to it as well
+multi_downloader = MultiMusicDownloader()
+
 class PlaylistService:
     """
     Service layer for playlist download operations.
@@ -622,24 +956,30 @@ class PlaylistService:
     """
     
     def __init__(self):
-        self._downloader = MultiMusicDownloader()
+        self._downloader = multi_downloader
     
-    def get_playlist_info(self, url: str):
+    def get_playlist_info(self, url: str, refresh: bool = False):
         """Get playlist information."""
-        return self._downloader.get_playlist_info(url)
+        return self._downloader.get_playlist_info(url, refresh)
     
-    def download_multiple(self, url: str, quality: str = "192", progress_tracker=None):
+    def invalidate(self, url: str):
+        """Drop cached playlist information."""
+        return self._downloader.invalidate(url)
+    
+    def clear_cache(self):
+        """Drop all cached playlist information."""
+        return self._downloader.clear_cache()
+    
+    def download_multiple(self, url: str, quality: str = "192", progress_tracker=None,
+                          info: Optional[Dict[str, Any]] = None):
         """Download multiple files from playlist."""
         quality_enum = AudioQuality(quality)
-        return self._downloader.download_multiple(url, quality_enum, progress_tracker)
+        return self._downloader.download_multiple(url, quality_enum, progress_tracker, info)
     
-    def create_zip(self, files: List[Dict[str, Any]], playlist_name: str):
+    def create_zip(self, files: List[DownloadedFile], playlist_name: str):
         """Create ZIP from downloaded files."""
         return self._downloader.create_playlist_zip(files, playlist_name)
     
-    def cleanup_files(self, files: List[Dict[str, Any]], keep_zip: bool = True):
+    def cleanup_files(self, files: List[DownloadedFile], keep_zip: bool = True):
         """Cleanup files after ZIP creation."""
         return self._downloader.cleanup_after_zip(files, keep_zip)
-
-# Legacy global instance for backward compatibility
-multi_downloader = MultiMusicDownloader()
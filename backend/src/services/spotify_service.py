@@ -3,37 +3,133 @@ Spotify service using spotdl directly as subprocess
 """
 
 import os
+import re
+import asyncio
 import logging
 import subprocess
 import json
 import tempfile
 import shutil
-from typing import Optional, List, Dict, Any
+import time
+import threading
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from pathlib import Path
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
 
-from .download_service import DownloadResult, AudioQuality
+from .download_service import DownloadResult, AudioQuality, init_spotify_client, search_spotify_tracks
 from ..core.utils import FileUtils
 
 logger = logging.getLogger(__name__)
 
+# spotdl output line reporting a finished track. Like the progress patterns
+# below it matches raw output bytes, so lines are never decoded
+_SPOTDL_STATUS_RE = re.compile(rb'\b(Downloaded|Skipping)\b')
+
+# spotdl progress: "NN%" and "X/Y complete"
+_PERCENT_RE = re.compile(rb'(\d{1,3})\s*%')
+_DONE_RE = re.compile(rb'(\d+)\s*/\s*(\d+)\s+complete', re.IGNORECASE)
+
+# spotdl ends lines with \n, and redraws its progress bar with \r
+_LINE_BREAK_RE = re.compile(rb'[\r\n]')
+
+class _ProgressRelay:
+    """
+    Forward progress updates to a tracker from a separate task.
+    
+    The spotdl output reader only queues (progress, status, message) events;
+    the relay task applies the newest event of each burst in a worker thread,
+    so a slow or locking tracker never holds up the reader.
+    """
+    
+    def __init__(self, progress_tracker, maxsize: int = 256):
+        self._tracker = progress_tracker
+        self._events: "asyncio.Queue[Optional[Tuple[int, str, str]]]" = asyncio.Queue(maxsize)
+        self._task = asyncio.create_task(self._run())
+    
+    def update(self, progress: int, status: str, message: str) -> None:
+        """Queue an update; dropped if the relay is this far behind."""
+        try:
+            self._events.put_nowait((progress, status, message))
+        except asyncio.QueueFull:
+            pass
+    
+    async def _run(self) -> None:
+        closing = False
+        while not closing:
+            event = await self._events.get()
+            # Coalesce everything queued meanwhile into its newest event
+            while not self._events.empty():
+                newer = self._events.get_nowait()
+                if newer is None:
+                    closing = True
+                else:
+                    event = newer
+            if event is None:
+                return
+            try:
+                await asyncio.to_thread(self._tracker.update, *event)
+            except Exception as e:
+                # A failing tracker must not stop the relay (aclose waits for it)
+                logger.error(f"Error updating download progress: {e}")
+    
+    async def aclose(self) -> None:
+        """Publish the remaining events and stop the relay task, without blocking on a full queue."""
+        try:
+            self._events.put_nowait(None)
+        except asyncio.QueueFull:
+            # The relay is far behind; drop the remaining events
+            self._task.cancel()
+        # wait() neither raises the task's cancellation nor blocks once it is done
+        await asyncio.wait([self._task])
+
 class SpotifyDownloader:
     """Simple Spotify downloader using spotdl command line tool"""
     
-    def __init__(self, output_dir: str = "./downloads"):
+    # Minimum seconds between percentage updates sent to the tracker
+    PROGRESS_UPDATE_INTERVAL = 0.1
+    
+    # Bytes read from spotdl's stdout at a time
+    OUTPUT_CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, output_dir: str = "./downloads", num_workers: Optional[int] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        # Concurrent spotdl processes for one playlist
+        self.num_workers = num_workers or min(8, os.cpu_count() or 1)
+        
+        # The environment doesn't change after startup, so the command is fixed
+        self._cmd_prefix = self._detect_spotdl_command()
+        # Set once spotdl has been found; a failed probe is retried next time
+        self._spotdl_ok = False
+        
+        # In-process spotdl downloader, shared by all downloads (None: not
+        # built yet, False: the library is unusable and the command is used)
+        self._library_downloader = None
+        self._library_init_lock = threading.Lock()
+        self._library_lock = threading.Lock()
         
     def download(self, spotify_url: str, quality: AudioQuality = AudioQuality.HIGH, 
                 progress_tracker=None) -> DownloadResult:
         """
         Download from Spotify URL using spotdl directly
+        
+        Blocking wrapper around download_async, for callers without an event loop.
+        """
+        return asyncio.run(self.download_async(spotify_url, quality, progress_tracker))
+    
+    async def download_async(self, spotify_url: str, quality: AudioQuality = AudioQuality.HIGH,
+                             progress_tracker=None) -> DownloadResult:
+        """
+        Download from Spotify URL using spotdl directly, without blocking the event loop
         """
         try:
             if progress_tracker:
                 progress_tracker.update(10, "initializing", "Iniciando descarga con spotdl...")
             
-            # Check if spotdl is available
-            if not self._check_spotdl_available():
+            # Check if spotdl is available, as a library or a command
+            if (await asyncio.to_thread(self._get_library_downloader) is None
+                    and not await asyncio.to_thread(self._check_spotdl_available)):
                 return DownloadResult(
                     success=False,
                     error="spotdl no está instalado o no está disponible en PATH"
@@ -43,7 +139,7 @@ class SpotifyDownloader:
                 progress_tracker.update(20, "processing", "Procesando URL de Spotify...")
             
             # Get track info first
-            track_info = self._get_track_info(spotify_url)
+            track_info = await asyncio.to_thread(self._get_track_info, spotify_url)
             if not track_info:
                 return DownloadResult(
                     success=False,
@@ -51,7 +147,7 @@ class SpotifyDownloader:
                 )
             
             # Download using spotdl
-            return self._download_with_spotdl(spotify_url, quality, track_info, progress_tracker)
+            return await self._download_with_spotdl(spotify_url, quality, track_info, progress_tracker)
             
         except Exception as e:
             logger.error(f"Error in Spotify download: {e}")
@@ -67,6 +163,15 @@ class SpotifyDownloader:
                          progress_tracker=None) -> List[DownloadResult]:
         """
         Download a Spotify playlist using spotdl
+        
+        Blocking wrapper around download_playlist_async, for callers without an event loop.
+        """
+        return asyncio.run(self.download_playlist_async(spotify_url, quality, progress_tracker))
+    
+    async def download_playlist_async(self, spotify_url: str, quality: AudioQuality = AudioQuality.HIGH,
+                                      progress_tracker=None) -> List[DownloadResult]:
+        """
+        Download a Spotify playlist using spotdl, without blocking the event loop
         """
         results = []
         try:
@@ -74,14 +179,14 @@ class SpotifyDownloader:
                 progress_tracker.update(5, "initializing", "Iniciando descarga de playlist...")
             
             # Check if spotdl is available
-            if not self._check_spotdl_available():
+            if not await asyncio.to_thread(self._check_spotdl_available):
                 return [DownloadResult(
                     success=False,
                     error="spotdl no está instalado o no está disponible en PATH"
                 )]
             
             # Get playlist info
-            playlist_info = self._get_playlist_info(spotify_url)
+            playlist_info = await asyncio.to_thread(self._get_playlist_info, spotify_url)
             if not playlist_info:
                 return [DownloadResult(
                     success=False,
@@ -92,7 +197,7 @@ class SpotifyDownloader:
                 progress_tracker.update(10, "processing", f"Descargando playlist: {playlist_info.get('name', 'Unknown')}")
             
             # Download entire playlist with spotdl
-            return self._download_playlist_with_spotdl(spotify_url, quality, playlist_info, progress_tracker)
+            return await self._download_playlist_with_spotdl(spotify_url, quality, playlist_info, progress_tracker)
             
         except Exception as e:
             logger.error(f"Error downloading playlist: {e}")
@@ -106,6 +211,11 @@ class SpotifyDownloader:
     
     def _get_spotdl_command(self) -> List[str]:
         """Get the correct spotdl command based on environment"""
+        return self._cmd_prefix
+    
+    @staticmethod
+    def _detect_spotdl_command() -> List[str]:
+        """Work out the spotdl command for this environment"""
         # Check if we're running in a uv environment
         if os.environ.get('VIRTUAL_ENV') or os.environ.get('UV_PROJECT_ENVIRONMENT'):
             # We're in a uv environment, use uv run
@@ -116,170 +226,168 @@ class SpotifyDownloader:
     
     def _check_spotdl_available(self) -> bool:
         """Check if spotdl is available in system PATH"""
+        if self._spotdl_ok:
+            return True
+        
         try:
             cmd = self._get_spotdl_command() + ['--version']
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
+            self._spotdl_ok = result.returncode == 0
+            return self._spotdl_ok
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
     
+    def _get_tracks(self, spotify_url: str, timeout: int = 30) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the tracks of a Spotify URL as `spotdl save` JSON dicts (name,
+        artists, album_name, duration, url, list_name...), or None on failure.
+        """
+        tracks = search_spotify_tracks(spotify_url)
+        if tracks is not None:
+            return tracks
+        
+        # The save file is unique per call and removed when the block exits
+        with tempfile.NamedTemporaryFile(suffix='.spotdl', delete_on_close=False) as save_file:
+            save_file.close()  # spotdl writes it by name
+            
+            cmd = self._get_spotdl_command() + ['save', spotify_url, '--save-file', save_file.name]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            if result.returncode != 0:
+                logger.warning(f"spotdl save failed: {result.stderr.strip()}")
+                return None
+            
+            with open(save_file.name, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    
     def _get_track_info(self, spotify_url: str) -> Optional[Dict[str, Any]]:
-        """Get track information using spotdl save command"""
+        """Get information of the (first) track of a Spotify URL"""
         try:
-            # Create temporary file for track info
-            with tempfile.NamedTemporaryFile(mode='w+', suffix='.txt', delete=False) as temp_file:
-                temp_path = temp_file.name
-            
-            # Use spotdl save to get track info
-            cmd = self._get_spotdl_command() + ['save', spotify_url, '--save-file', temp_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0 and os.path.exists(temp_path):
-                with open(temp_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                
-                os.unlink(temp_path)
-                
-                # Parse the content - spotdl save outputs track info
-                if content:
-                    # spotdl save typically outputs: "Artist - Track Name"
-                    lines = content.split('\n')
-                    first_track = lines[0] if lines else content
-                    
-                    if ' - ' in first_track:
-                        artist, title = first_track.split(' - ', 1)
-                        return {
-                            'artist': artist.strip(),
-                            'title': title.strip(),
-                            'name': title.strip(),
-                            'full_name': first_track.strip()
-                        }
-                    else:
-                        return {
-                            'artist': 'Unknown Artist',
-                            'title': first_track.strip(),
-                            'name': first_track.strip(),
-                            'full_name': first_track.strip()
-                        }
-            
-            # Cleanup temp file if it exists
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-            
-            return None
+            tracks = self._get_tracks(spotify_url)
+            if not tracks:
+                return None
+            
+            track = tracks[0]
+            artist = ', '.join(track.get('artists') or ['Unknown Artist'])
+            title = track.get('name', 'Unknown')
+            return {
+                'artist': artist,
+                'title': title,
+                'name': title,
+                'full_name': f"{artist} - {title}",
+                'album': track.get('album_name') or 'Unknown',
+                'duration': track.get('duration') or 0,
+                # Reused by the download, so the URL isn't resolved twice
+                'tracks': tracks
+            }
             
         except Exception as e:
             logger.error(f"Error getting track info: {e}")
             return None
     
     def _get_playlist_info(self, spotify_url: str) -> Optional[Dict[str, Any]]:
-        """Get playlist information"""
+        """
+        Get playlist information, including the track URLs the download is
+        split by, from a single track lookup
+        """
         try:
-            # For playlists, we can use the same save method
-            info = self._get_track_info(spotify_url)
-            if info:
+            tracks = self._get_tracks(spotify_url, timeout=120)
+            if tracks:
                 return {
-                    'name': info.get('full_name', 'Spotify Playlist'),
-                    'track_count': 1  # We'll update this during download
+                    'name': tracks[0].get('list_name') or 'Spotify Playlist',
+                    'track_count': len(tracks),
+                    # Duplicates would be downloaded by two shards at once
+                    'track_urls': list(dict.fromkeys(track['url'] for track in tracks if track.get('url')))
                 }
             return None
         except Exception as e:
             logger.error(f"Error getting playlist info: {e}")
             return None
     
-    def _download_with_spotdl(self, spotify_url: str, quality: AudioQuality, 
+    @staticmethod
+    def _list_mp3_files(directory: str) -> List[os.DirEntry]:
+        """List the MP3 files spotdl left in a directory, in one scandir pass"""
+        with os.scandir(directory) as entries:
+            return [entry for entry in entries if entry.name.endswith('.mp3')]
+    
+    def _finalize_download(self, temp_dir: str, quality: AudioQuality) -> Optional[Tuple[str, int, str]]:
+        """
+        Move the track spotdl left in temp_dir to the output directory.
+        
+        Returns its final path, size and hash, or None if there is no MP3 file.
+        """
+        downloaded_files = self._list_mp3_files(temp_dir)
+        if not downloaded_files:
+            return None
+        
+        downloaded_file = downloaded_files[0]
+        final_path = str(self.output_dir / f"{downloaded_file.name[:-4]}_{quality.value}kbps.mp3")
+        FileUtils.move_file(downloaded_file.path, final_path)
+        
+        # Size and identity key from one stat; no need to read the file
+        file_size, file_hash = FileUtils.get_file_size_and_identity(final_path)
+        return final_path, file_size, file_hash
+    
+    async def _download_with_spotdl(self, spotify_url: str, quality: AudioQuality, 
                              track_info: Dict[str, Any], progress_tracker=None) -> DownloadResult:
-        """Download using spotdl command"""
+        """Download using spotdl, in-process when the library is usable, else the command"""
         try:
             if progress_tracker:
                 progress_tracker.update(30, "downloading", "Descargando con spotdl...")
             
-            # Create temporary directory for download
-            temp_dir = tempfile.mkdtemp(prefix="spotdl_download_")
-            
-            # Build spotdl command
-            cmd = self._get_spotdl_command() + [
-                spotify_url,
-                '--output', temp_dir,
-                '--bitrate', str(quality.value),
-                '--format', 'mp3'
-            ]
-            
-            # Run spotdl
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                                     text=True, bufsize=1, universal_newlines=True)
-            
-            # Monitor progress
-            output_lines = []
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    output_lines.append(output.strip())
-                    if progress_tracker:
-                        # Update progress based on spotdl output
-                        if "%" in output:
-                            try:
-                                # Extract percentage from spotdl output
-                                percentage_str = output.split('%')[0].split()[-1]
-                                percentage = int(percentage_str)
-                                progress_tracker.update(30 + int(percentage * 0.6), "downloading", 
-                                                      f"Descargando: {percentage}%")
-                            except:
-                                pass
-            
-            # Wait for completion
-            return_code = process.poll()
-            stderr = process.stderr.read()
-            
-            if return_code != 0:
-                logger.error(f"spotdl failed with code {return_code}: {stderr}")
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                return DownloadResult(
-                    success=False,
-                    error=f"spotdl falló: {stderr}"
-                )
-            
-            if progress_tracker:
-                progress_tracker.update(95, "processing", "Procesando archivo descargado...")
+            # Create temporary directory for download, inside the output directory
+            # so the finished file is renamed into place instead of copied
+            temp_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix=".spotdl_tmp_", dir=self.output_dir)
+            try:
+                if await asyncio.to_thread(self._download_with_library, track_info['tracks'], quality, temp_dir):
+                    return_code, stderr = 0, ""
+                else:
+                    # The library is unusable or produced no file; the availability
+                    # check in download_async may have passed on the library alone
+                    if not await asyncio.to_thread(self._check_spotdl_available):
+                        return DownloadResult(
+                            success=False,
+                            error="spotdl no está instalado o no está disponible en PATH"
+                        )
+                    return_code, stderr = await self._run_spotdl_with_progress(spotify_url, temp_dir, quality, progress_tracker)
+                
+                if return_code != 0:
+                    logger.error(f"spotdl failed with code {return_code}: {stderr}")
+                    return DownloadResult(
+                        success=False,
+                        error=f"spotdl falló: {stderr}"
+                    )
+                
+                if progress_tracker:
+                    progress_tracker.update(95, "processing", "Procesando archivo descargado...")
+                
+                finalized = await asyncio.to_thread(self._finalize_download, temp_dir, quality)
+            finally:
+                await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
             
-            # Find downloaded file
-            downloaded_files = list(Path(temp_dir).glob("*.mp3"))
-            if not downloaded_files:
-                shutil.rmtree(temp_dir, ignore_errors=True)
+            if finalized is None:
                 return DownloadResult(
                     success=False,
                     error="No se encontró archivo descargado"
                 )
             
-            downloaded_file = downloaded_files[0]
-            
-            # Move to final location
-            final_filename = f"{downloaded_file.stem}_{quality.value}kbps.mp3"
-            final_path = self.output_dir / final_filename
-            
-            shutil.move(str(downloaded_file), str(final_path))
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            
-            # Get file info
-            file_size = FileUtils.get_file_size(str(final_path))
+            final_path, file_size, file_hash = finalized
+            final_filename = os.path.basename(final_path)
             
             if progress_tracker:
                 progress_tracker.update(100, "completed", f"Descarga completada: {final_filename}")
             
             return DownloadResult(
                 success=True,
-                file_path=str(final_path),
+                file_path=final_path,
                 metadata={
                     "title": track_info.get('title', 'Unknown'),
                     "artist": track_info.get('artist', 'Unknown'),
-                    "album": "Unknown",
-                    "duration": 0,
+                    "album": track_info.get('album', 'Unknown'),
+                    "duration": track_info.get('duration', 0),
                     "quality": quality.value,
                     "platform": "spotify",
                     "source_url": spotify_url,
-                    "file_hash": FileUtils.get_file_hash(str(final_path))
+                    "file_hash": file_hash
                 },
                 file_size=file_size
             )
@@ -294,101 +402,240 @@ class SpotifyDownloader:
                 error=f"Error en descarga: {str(e)}"
             )
     
-    def _download_playlist_with_spotdl(self, spotify_url: str, quality: AudioQuality,
-                                      playlist_info: Dict[str, Any], progress_tracker=None) -> List[DownloadResult]:
-        """Download playlist using spotdl"""
-        results = []
+    def _shard_urls(self, track_urls: List[str]) -> List[List[str]]:
+        """Split track URLs round-robin into at most num_workers shards."""
+        shard_count = min(self.num_workers, len(track_urls))
+        return [track_urls[i::shard_count] for i in range(shard_count)]
+    
+    async def _run_spotdl(self, urls: List[str], output: str, quality: AudioQuality,
+                          on_line: Optional[Callable[[bytes], None]] = None) -> Tuple[int, str]:
+        """
+        Download URLs as MP3 with one spotdl process.
+        
+        output is a directory or a spotdl output template. Every stdout line
+        is passed to on_line as raw bytes. Returns the return code and the
+        decoded stderr.
+        """
+        cmd = self._get_spotdl_command() + urls + [
+            '--output', output,
+            '--bitrate', str(quality.value),
+            '--format', 'mp3'
+        ]
+        
+        # stderr is collected alongside so neither pipe can fill up
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stderr_task = asyncio.create_task(process.stderr.read())
+        
+        # Output is read in chunks as it arrives until EOF and split on \r as well
+        # as \n, so progress redraws arrive one by one and no line is too long.
+        # The exit status is collected once after.
+        pending = b''
+        while chunk := await process.stdout.read(self.OUTPUT_CHUNK_SIZE):
+            *lines, pending = _LINE_BREAK_RE.split(pending + chunk)
+            if on_line:
+                for line in lines:
+                    if line:
+                        on_line(line)
+        if pending and on_line:
+            on_line(pending)
+        
+        return_code = await process.wait()
+        return return_code, (await stderr_task).decode(errors='replace')
+    
+    async def _run_playlist_shard(self, urls: List[str], output: str, quality: AudioQuality,
+                                  progress: Dict[str, int], progress_tracker=None) -> Tuple[int, str]:
+        """Download some playlist tracks with one spotdl process. Returns (return code, stderr)."""
+        def on_line(output: bytes) -> None:
+            if progress["total"]:
+                # Shards share the count of finished tracks
+                if _SPOTDL_STATUS_RE.search(output):
+                    progress["completed"] += 1
+                    completed, total = progress["completed"], progress["total"]
+                    percentage = int((completed / total) * 100)
+                    progress_tracker.update(20 + int(percentage * 0.7), "downloading",
+                                          f"Descargando: {completed}/{total} canciones")
+            else:
+                # Extract progress info from spotdl's "X/Y complete" output
+                match = _DONE_RE.search(output)
+                if match and int(match.group(2)):
+                    completed, total = map(int, match.groups())
+                    percentage = int((completed / total) * 100)
+                    progress_tracker.update(20 + int(percentage * 0.7), "downloading",
+                                          f"Descargando: {completed}/{total} canciones")
+        
+        return await self._run_spotdl(urls, output, quality, on_line if progress_tracker else None)
+    
+    def _get_library_downloader(self):
+        """Return the shared in-process spotdl Downloader, or None when the spotdl command must be used"""
+        with self._library_init_lock:
+            if self._library_downloader is None:
+                self._library_downloader = False
+                if init_spotify_client():
+                    try:
+                        from spotdl.download.downloader import Downloader
+                        
+                        # One downloader (event loop, HTTP sessions) for the process lifetime
+                        self._library_downloader = Downloader(settings={"format": "mp3", "threads": 8})
+                    except Exception as e:
+                        logger.warning(f"spotdl downloader unavailable, using the spotdl command: {e}")
+            return self._library_downloader or None
+    
+    def _download_with_library(self, tracks: List[Dict[str, Any]], quality: AudioQuality, output: str) -> bool:
+        """
+        Download already resolved tracks (`spotdl save` JSON dicts) into output
+        with the shared spotdl Downloader.
+        
+        Returns whether anything was downloaded; False means the spotdl command
+        should run instead.
+        """
+        downloader = self._get_library_downloader()
+        if downloader is None:
+            return False
+        
+        try:
+            from spotdl.types.song import Song
+            
+            songs = [Song.from_dict(track) for track in tracks]
+            # The downloader runs its own event loop, so one download at a time
+            with self._library_lock:
+                downloader.settings.update(output=output, bitrate=f"{quality.value}k")
+                results = downloader.download_multiple_songs(songs)
+            return any(path for _, path in results)
+        except Exception as e:
+            logger.warning(f"spotdl library download failed, using the spotdl command: {e}")
+            return False
+    
+    async def _run_spotdl_with_progress(self, spotify_url: str, output: str, quality: AudioQuality,
+                                        progress_tracker=None) -> Tuple[int, str]:
+        """Download a single URL with the spotdl command, reporting its percentage"""
+        if not progress_tracker:
+            return await self._run_spotdl([spotify_url], output, quality)
+        
+        relay = _ProgressRelay(progress_tracker)
+        last_percentage = -1
+        last_update = 0.0
+        
+        def on_line(line: bytes) -> None:
+            nonlocal last_percentage, last_update
+            # Update progress based on spotdl output, skipping repeated
+            # percentages and coalescing bursts
+            match = _PERCENT_RE.search(line)
+            if match:
+                percentage = min(int(match.group(1)), 100)
+                now = time.monotonic()
+                if percentage != last_percentage and now - last_update >= self.PROGRESS_UPDATE_INTERVAL:
+                    last_percentage, last_update = percentage, now
+                    relay.update(30 + int(percentage * 0.6), "downloading", 
+                                 f"Descargando: {percentage}%")
+        
         try:
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp(prefix="spotdl_playlist_")
+            return await self._run_spotdl([spotify_url], output, quality, on_line)
+        finally:
+            await relay.aclose()
+    
+    def _finalize_track(self, downloaded_file: os.DirEntry, quality: AudioQuality,
+                        spotify_url: str) -> DownloadResult:
+        """Move a playlist track, already under its final name, to the output directory and describe it"""
+        try:
+            title = downloaded_file.name[:-len(self._file_suffix(quality))]
+            final_path = str(self.output_dir / downloaded_file.name)
             
-            # Build command for playlist
-            cmd = self._get_spotdl_command() + [
-                spotify_url,
-                '--output', temp_dir,
-                '--bitrate', str(quality.value),
-                '--format', 'mp3'
-            ]
+            # The temp dir is inside the output directory, so this is a rename
+            os.replace(downloaded_file.path, final_path)
             
-            if progress_tracker:
-                progress_tracker.update(20, "downloading", "Descargando playlist completa...")
-            
-            # Run spotdl for playlist
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                     text=True, bufsize=1, universal_newlines=True)
-            
-            # Monitor progress
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output and progress_tracker:
-                    # Extract progress info from spotdl output
-                    if "complete" in output.lower() and "/" in output:
-                        try:
-                            # Parse "X/Y complete" format
-                            parts = output.split()
-                            for part in parts:
-                                if "/" in part:
-                                    completed, total = part.split("/")
-                                    percentage = int((int(completed) / int(total)) * 100)
-                                    progress_tracker.update(20 + int(percentage * 0.7), "downloading",
-                                                          f"Descargando: {completed}/{total} canciones")
-                                    break
-                        except:
-                            pass
-            
-            return_code = process.poll()
-            stderr = process.stderr.read()
-            
-            if return_code != 0:
-                logger.error(f"spotdl playlist download failed: {stderr}")
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                return [DownloadResult(
-                    success=False,
-                    error=f"Error descargando playlist: {stderr}"
-                )]
+            file_size, file_hash = FileUtils.get_file_size_and_identity(final_path)
             
-            if progress_tracker:
-                progress_tracker.update(95, "processing", "Procesando archivos descargados...")
-            
-            # Process downloaded files
-            downloaded_files = list(Path(temp_dir).glob("*.mp3"))
+            return DownloadResult(
+                success=True,
+                file_path=final_path,
+                metadata={
+                    "title": title,
+                    "artist": "Unknown",
+                    "album": "Unknown",
+                    "duration": 0,
+                    "quality": quality.value,
+                    "platform": "spotify",
+                    "source_url": spotify_url,
+                    "file_hash": file_hash
+                },
+                file_size=file_size
+            )
             
-            for i, downloaded_file in enumerate(downloaded_files):
+        except Exception as e:
+            logger.error(f"Error processing file {downloaded_file.path}: {e}")
+            return DownloadResult(
+                success=False,
+                error=f"Error procesando {downloaded_file.name}: {str(e)}"
+            )
+    
+    @staticmethod
+    def _file_suffix(quality: AudioQuality) -> str:
+        """Ending of the final name of a downloaded track"""
+        return f"_{quality.value}kbps.mp3"
+    
+    async def _download_playlist_with_spotdl(self, spotify_url: str, quality: AudioQuality,
+                                      playlist_info: Dict[str, Any], progress_tracker=None) -> List[DownloadResult]:
+        """Download playlist using spotdl"""
+        results = []
+        try:
+            # Each run downloads into its own temp dir (inside the output directory,
+            # see above), so only its own tracks are picked up afterwards. spotdl
+            # already gives them their final name: its default name plus the quality.
+            temp_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix=".spotdl_tmp_", dir=self.output_dir)
+            output = os.path.join(temp_dir, f"{{artists}} - {{title}}_{quality.value}kbps.{{output-ext}}")
+            
+            try:
+                # The tracks are split across several spotdl processes; without
+                # their URLs the playlist URL is one shard
+                track_urls = playlist_info.get('track_urls') or []
+                shards = self._shard_urls(track_urls) if track_urls else [[spotify_url]]
+                
+                if progress_tracker:
+                    progress_tracker.update(20, "downloading", "Descargando playlist completa...")
+                
+                logger.info(f"Downloading Spotify playlist with {len(shards)} spotdl process(es)")
+                progress = {"completed": 0, "total": len(track_urls)}
+                # Shard readers publish through one relay task
+                relay = _ProgressRelay(progress_tracker) if progress_tracker else None
                 try:
-                    # Move each file to final location
-                    final_filename = f"{downloaded_file.stem}_{quality.value}kbps.mp3"
-                    final_path = self.output_dir / final_filename
-                    
-                    shutil.move(str(downloaded_file), str(final_path))
-                    
-                    file_size = FileUtils.get_file_size(str(final_path))
-                    
-                    results.append(DownloadResult(
-                        success=True,
-                        file_path=str(final_path),
-                        metadata={
-                            "title": downloaded_file.stem,
-                            "artist": "Unknown",
-                            "album": "Unknown",
-                            "duration": 0,
-                            "quality": quality.value,
-                            "platform": "spotify",
-                            "source_url": spotify_url,
-                            "file_hash": FileUtils.get_file_hash(str(final_path))
-                        },
-                        file_size=file_size
+                    outcomes = await asyncio.gather(*(
+                        self._run_playlist_shard(shard, output, quality, progress, relay)
+                        for shard in shards
                     ))
-                    
-                except Exception as e:
-                    logger.error(f"Error processing file {downloaded_file}: {e}")
-                    results.append(DownloadResult(
+                finally:
+                    if relay:
+                        await relay.aclose()
+                
+                errors = [stderr for return_code, stderr in outcomes if return_code != 0]
+                if len(errors) == len(outcomes):
+                    logger.error(f"spotdl playlist download failed: {errors[0]}")
+                    return [DownloadResult(
                         success=False,
-                        error=f"Error procesando {downloaded_file.name}: {str(e)}"
-                    ))
-            
-            shutil.rmtree(temp_dir, ignore_errors=True)
+                        error=f"Error descargando playlist: {errors[0]}"
+                    )]
+                if errors:
+                    # Tracks of the other shards are still returned
+                    logger.warning(f"{len(errors)} of {len(outcomes)} spotdl processes failed: {errors[0]}")
+                
+                if progress_tracker:
+                    progress_tracker.update(95, "processing", "Procesando archivos descargados...")
+                
+                # Process downloaded files. Hashing is I/O bound, so the files are
+                # finalized in parallel (results keep the listing order)
+                def finalize_all() -> List[DownloadResult]:
+                    downloaded_files = self._list_mp3_files(temp_dir)
+                    if not downloaded_files:
+                        return []
+                    with ThreadPoolExecutor(max_workers=min(8, len(downloaded_files))) as executor:
+                        return list(executor.map(
+                            self._finalize_track, downloaded_files, repeat(quality), repeat(spotify_url)
+                        ))
+                
+                results = await asyncio.to_thread(finalize_all)
+            finally:
+                await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
             
             if progress_tracker:
                 progress_tracker.update(100, "completed", f"Playlist descargada: {len(results)} archivos")
@@ -5,6 +5,7 @@ import type {
   DownloadRequest, 
   PlaylistDownloadResponse, 
   MultiProgressData, 
+  MultiProgressFrame,
   PlaylistInfo,
   PlaylistInfoResponse,
   DownloadedFile,
@@ -46,6 +47,28 @@ export interface UsePlaylistDownloadResult {
   cleanupFiles: (keepZip?: boolean) => Promise<boolean>
 }
 
+// Aplica un frame SSE sobre el estado anterior
+function mergeMultiProgress(prev: MultiProgressData | null, frame: MultiProgressFrame): MultiProgressData {
+  const { type, deltas, files_info, ...summary } = frame
+
+  if (type !== "delta") {
+    return { ...summary, files_info: files_info ?? [] }
+  }
+
+  const filesInfo = [...(prev?.files_info ?? [])]
+  for (const delta of deltas ?? []) {
+    const current = filesInfo[delta.i] ?? { index: delta.i, name: "", status: "pending", progress: 0 }
+    filesInfo[delta.i] = {
+      ...current,
+      progress: delta.progress,
+      status: delta.status,
+      name: delta.name ?? current.name,
+    }
+  }
+
+  return { ...summary, files_info: filesInfo }
+}
+
 export function usePlaylistDownload(): UsePlaylistDownloadResult {
   const [playlistInfo, setPlaylistInfo] = useState<PlaylistInfo | null>(null)
   const [isLoadingInfo, setIsLoadingInfo] = useState(false)
@@ -222,9 +245,9 @@ export function usePlaylistDownload(): UsePlaylistDownloadResult {
 
       eventSource.onmessage = (event) => {
         try {
-          const progressData: MultiProgressData = JSON.parse(event.data)
+          const progressData: MultiProgressFrame = JSON.parse(event.data)
           
-          setMultiProgress(progressData)
+          setMultiProgress(prev => mergeMultiProgress(prev, progressData))
           
           if (progressData.error) {
             setError(progressData.error)
@@ -113,6 +113,22 @@ export interface MultiProgressData {
   timestamp: number
 }
 
+// Cambio de un archivo dentro de un frame "delta"
+export interface FileInfoDelta {
+  i: number
+  progress: number
+  status: FileInfo["status"]
+  name?: string
+}
+
+// Frame recibido por SSE: los frames "full" traen files_info completo,
+// los "delta" sólo los archivos que cambiaron desde el frame anterior
+export interface MultiProgressFrame extends Omit<MultiProgressData, "files_info"> {
+  type: "full" | "delta"
+  files_info?: FileInfo[]
+  deltas?: FileInfoDelta[]
+}
+
 export interface PlaylistDownloadResponse {
   download_id: string
   message: string